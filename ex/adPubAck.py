@@ -4,28 +4,20 @@ from pysolclient import *
 import common
 import sys
 import time
-import collections as co
 
-class AckTracker:
-    def __init__(self, msg):
-        self.msg = msg #retain msg ref for eventCallback
-        self.acked = False
-        self.accepted = False
+registry = None
+
+def onSettled(msg, accepted):
+    print('{} Seq {}'.format('Acknowledged' if accepted else 'Rejected', msg.getSeqNum()))
 
 def eventCallback(session_p, eventInfo_p, user_p):
     event = eventInfo_p.contents.sessionEvent
-    corr_p  = eventInfo_p.contents.correlation_p
 
     if event == SessionEvent.ACKNOWLEDGEMENT:
         LOG.log(LOG.INFO, 'eventCallback - {}'.format(
                 SessionEvent.toString(event)))
 
-        acker = common.cbObject.deref(corr_p)
-        print('Acknowledged Seq {}'.format(acker.msg.getSeqNum()))
-        # remove circular ref
-        del acker.msg
-        acker.accepted = True
-        acker.acked = True
+        registry.onEvent(eventInfo_p)
         return
 
     if event == SessionEvent.REJECTED_MSG_ERROR:
@@ -37,12 +29,7 @@ def eventCallback(session_p, eventInfo_p, user_p):
                     info_p.contents.responseCode,
                     info_p.contents.errorStr.decode()) )
 
-        acker = common.cbObject.deref(corr_p)
-        print('Rejected Seq {}'.format(acker.msg.getSeqNum()))
-        # remove circular ref
-        del acker.msg
-        acker.accepted = False
-        acker.acked = True
+        registry.onEvent(eventInfo_p)
         return
 
     if event == SessionEvent.UP_NOTICE or \
@@ -78,10 +65,12 @@ def eventCallback(session_p, eventInfo_p, user_p):
                     SessionEvent.toString(event)))
 
 def main_run():
+    global registry
     conf = common.init('n', (True, *'tq'))
     
     context = Context()
     sprops = SessionProperties(HOST=conf.host, VPN_NAME=conf.user.vpn, USERNAME=conf.user.name, GENERATE_SEQUENCE_NUMBER="1")
+    registry = CorrelationRegistry.fromProps(sprops, onSettled)
     
     def rxMsgCallback(session_p, msg_p, user_p):
         return CALLBACK_OK
@@ -103,41 +92,32 @@ def main_run():
     else:
         raise RuntimeError('Invalid topic or queue')
     
-    atqueue = co.deque()
     while conf.num > 0:
         msg = Message()
-        at = AckTracker(msg)
-        atqueue.append(at)
 
         err = msg.applyProps( \
                 Dest=dest,
                 BinaryAttachment='Hello World!\n'.encode(),
-                Delivery=Message.DELIVERY_MODE_PERSISTENT,
-                CorrTag=common.cbObject.wrap(at))
+                Delivery=Message.DELIVERY_MODE_PERSISTENT)
 
         if err:
             for n, e in err.items():
                 print('Cannot set {}:\t{}: {}'.format(n, type(e).__name__, str(e)))
             raise RuntimeError('Cannot continue')
 
+        # blocks while the publish window is full
+        registry.track(msg, msg)
         session.sendMsg(msg)
         conf.num -= 1
         print('Message sent, {} to go'.format(conf.num))
     
     print('Waiting for acks')
-    numAcked = 0
-    numAccepted = 0
-    while len(atqueue) > 0:
-        if atqueue[0].acked:
-            numAcked += 1
-            if atqueue[0].accepted:
-                numAccepted += 1
-            atqueue.pop()
+    registry.wait()
     
     time.sleep(0.1)
     session.disconnect()
 
-    print('{} acked, {} accepted'.format(numAcked, numAccepted))
+    print('{} acked, {} accepted'.format(registry.acked + registry.rejected, registry.acked))
 
 if __name__ == '__main__':
     main_run()
@@ -0,0 +1,3555 @@
+from ctypes import *
+from ctypes import _CFuncPtr
+
+from traceback import extract_stack as extract_stack, format_exc
+from functools import singledispatch, lru_cache
+from collections import deque, OrderedDict
+
+import inspect
+import itertools
+import os
+import os.path
+import queue
+import string
+import threading
+import time
+import weakref
+import zlib
+
+# ENUM callback types
+(CALLBACK_OK, CALLBACK_TAKE_MSG) = [0,1]
+
+# ENUM context timer
+(CONTEXT_TIMER_ONE_SHOT, CONTEXT_TIMER_REPEAT) = [0, 1]
+
+# ENUM dispatch 
+DISPATCH_TYPE_CALLBACK = 1
+
+# Enable, Disable
+(PROP_DISABLE_VAL, PROP_ENABLE_VAL) = ("0", "1")
+
+# Some Props
+SOLCLIENT_MODIFYPROP_FLAGS_WAITFORCONFIRM = (0x01)
+SOLCLIENT_TRANSPORT_PROTOCOL_NULL = ("")
+SOLCLIENT_SESSION_SEND_MULTIPLE_LIMIT = 50
+SOLCLIENT_MAX_SELECTOR_SIZE = (1023)
+
+@singledispatch
+def _toBytes(b):
+    return repr(b).encode()
+_toBytes.register(bytes, lambda b: b)
+_toBytes.register(str, lambda s: s.encode())
+_toBytes.register(type(None), lambda b: None)
+
+##############
+# Init DLL
+##############
+
+from ctypes.util import find_library
+
+# PYSOLCLIENT_LAZY=1 defers loading libsolclient until the first native call;
+# each native function is bound on first use and solClient_initialize()
+# runs once the library is loaded.
+LAZY_INIT = os.environ.get('PYSOLCLIENT_LAZY', '0') not in ('', '0')
+
+def _loadLibrary():
+    _library_name = find_library('libsolclient')
+    if _library_name:
+        return cdll.LoadLibrary(_library_name)
+    else:
+        raise ImportError('libsolclient not found')
+
+"""
+Lazy stand-ins for native symbols. Attribute assignments (argtypes, restype,
+errcheck) are recorded and applied when the symbol is bound. As a class
+attribute, the symbol replaces itself with the bound native object on first
+access, so later calls go straight to ctypes.
+"""
+class _LazySymbol:
+    def __init__(self, name):
+        self.name = name
+        self._owners = []
+
+    def __set_name__(self, owner, attr):
+        self._owners.append((owner, attr))
+
+    def __get__(self, obj, objtype=None):
+        return self._bind()
+
+    def _bind(self):
+        sym = self._resolve(_LazyLibrary.load())
+        for owner, attr in self._owners:
+            if vars(owner).get(attr) is self:
+                setattr(owner, attr, sym)
+        return sym
+
+class _LazyFunc(_LazySymbol):
+    _protoAttrs = ('argtypes', 'restype', 'errcheck')
+
+    def __init__(self, name, fresh=False):
+        super().__init__(name)
+        self._fresh = fresh
+        self._proto = {}
+        self._func = None
+
+    def __setattr__(self, k, v):
+        if k in self._protoAttrs:
+            self._proto[k] = v
+        else:
+            super().__setattr__(k, v)
+
+    def _resolve(self, lib):
+        if self._func is None:
+            f = lib[self.name] if self._fresh else getattr(lib, self.name)
+            for k, v in self._proto.items():
+                setattr(f, k, v)
+            self._func = f
+        return self._func
+
+    def __call__(self, *args):
+        return self._bind()(*args)
+
+class _LazyVar(_LazySymbol):
+    def __init__(self, ctype, name):
+        super().__init__(name)
+        self.ctype = ctype
+        self._var = None
+
+    def _resolve(self, lib):
+        if self._var is None:
+            self._var = self.ctype.in_dll(lib, self.name)
+        return self._var
+
+class _LazyLibrary:
+    _lock = threading.Lock()
+    _loaded = None
+
+    def __init__(self):
+        self._funcs = {}
+
+    def __getattr__(self, name):
+        if name[:2] == '__':
+            raise AttributeError(name)
+        # same object per name, like CDLL
+        return self._funcs.setdefault(name, _LazyFunc(name))
+
+    def __getitem__(self, name):
+        return _LazyFunc(name, fresh=True)
+
+    @classmethod
+    def load(cls):
+        if cls._loaded is None:
+            with cls._lock:
+                if cls._loaded is None:
+                    lib = _loadLibrary()
+                    _initialize(lib)
+                    cls._loaded = lib
+        return cls._loaded
+
+def _library():
+    return _LazyLibrary.load() if LAZY_INIT else _lib
+
+def _in_dll(ctype, name):
+    if LAZY_INIT:
+        return _LazyVar(ctype, name)
+    return ctype.in_dll(_lib, name)
+
+if LAZY_INIT:
+    _lib = _LazyLibrary()
+else:
+    _lib = _loadLibrary()
+
+# getLastErrorInfo()
+class ErrorInfo(Structure):
+    STR_SIZE = 256
+    _fields_ = [ ('subCode', c_int), ('responseCode', c_uint32), ('errorStr', c_char * STR_SIZE) ]
+
+getLastErrorInfo = _lib.solClient_getLastErrorInfo
+getLastErrorInfo.argtypes = []
+getLastErrorInfo.restype  = POINTER(ErrorInfo)
+
+class BufInfo:
+    MAX_CORRELATION_TAG_SIZE = 16
+    MAX_DURABLE_QUEUENAME_SIZE = 200
+    MAX_QUEUENAME_SIZE = 250
+    MAX_TOPIC_SIZE = 250
+    MAX_USER_DATA_SIZE = 36
+
+class SubscribeFlags:
+    LOCAL_DISPATCH_ONLY = 0x08
+    REQUEST_CONFIRM = 0x10
+    RX_ALL_DELIVER_TO_ONE = 0x04
+    WAITFORCONFIRM = 0x02
+
+class ProvisionFlags:
+    IGNORE_EXIST_ERRORS = 0x02
+    WAITFORCONFIRM = 0x01
+
+class SessionEvent:
+    # ENUM session events
+    (UP_NOTICE, DOWN_ERROR, CONNECT_FAILED_ERROR, REJECTED_MSG_ERROR, SUBSCRIPTION_ERROR, RX_MSG_TOO_BIG_ERROR, ACKNOWLEDGEMENT, ASSURED_PUBLISHING_UP, ASSURED_CONNECT_FAILED, ASSURED_DELIVERY_DOWN, TE_UNSUBSCRIBE_ERROR, DTE_UNSUBSCRIBE_ERROR, TE_UNSUBSCRIBE_OK, DTE_UNSUBSCRIBE_OK, CAN_SEND, RECONNECTING_NOTICE, RECONNECTED_NOTICE, PROVISION_ERROR, PROVISION_OK, SUBSCRIPTION_OK, VIRTUAL_ROUTER_NAME_CHANGED, MODIFYPROP_OK, MODIFYPROP_FAIL, REPUBLISH_UNACKED_MESSAGES) = list(range(8)) + [8, 8, 9, 9, 10, 10] + list(range(11,21))
+    
+    _toString = _lib.solClient_session_eventToString
+    _toString.argtypes = [ c_int ]
+    _toString.restype = c_char_p
+
+    @classmethod
+    def toString(cls, event):
+        return cls._toString(event).decode()
+
+class ReturnCode:
+    # ENUM return codes
+    (FAIL, OK, WOULD_BLOCK, IN_PROGRESS, NOT_READY, EOS, NOT_FOUND, NOEVENT, INCOMPLETE, ROLLBACK) = range(-1,9)
+
+    _toString = _lib.solClient_returnCodeToString
+    _toString.argtypes = [ c_int ]
+    _toString.restype = c_char_p
+
+    @classmethod
+    def toString(cls, event):
+        return cls._toString(event).decode()
+
+    @staticmethod
+    def raiseExcept(codes):
+        def errcheck(rc, f, args):
+            if not rc in codes:
+                raise SolaceError(rc, '{}(), args={}'.format(f.__name__, repr(args)))
+
+            return rc
+        return errcheck
+    
+    @staticmethod
+    def raiseNotOK(rc, f, args):
+        if rc != ReturnCode.OK:
+            raise SolaceError(rc, '{}(), args={}'.format(f.__name__, repr(args)))
+        return rc
+    
+    @staticmethod
+    def returnRefParam1(rc, f, args):
+        if rc == ReturnCode.NOT_FOUND:
+            return None
+        if rc != ReturnCode.OK:
+            raise SolaceError(rc, f.__name__)
+
+        return args[1]._obj.value
+
+    @staticmethod
+    def returnRefParam1Obj(rc, f, args):
+        if rc == ReturnCode.NOT_FOUND:
+            return None
+        if rc != ReturnCode.OK:
+            raise SolaceError(rc, f.__name__)
+
+        return args[1]._obj
+
+    @staticmethod
+    def returnRefCharArrayAsBytes(rc, f, args):
+        if rc == ReturnCode.NOT_FOUND:
+            return None
+        if rc != ReturnCode.OK:
+            raise SolaceError(rc, f.__name__)
+
+        return cast(args[1]._obj, POINTER(c_char * args[2]._obj.value)).contents.raw
+
+    @staticmethod
+    def returnRefCharArray(rc, f, args):
+        if rc == ReturnCode.NOT_FOUND:
+            return None
+        if rc != ReturnCode.OK:
+            raise SolaceError(rc, f.__name__)
+
+        return (c_char * args[2]._obj.value).from_address(args[1]._obj.value or 0)
+
+    @staticmethod
+    def returnString(rc, f, args):
+        if rc != ReturnCode.OK:
+            raise SolaceError(rc, f.__name__)
+
+        return cast(args[1], POINTER(c_char * args[2])).contents.value.decode()
+
+    @staticmethod
+    def returnBool(rc, f, args):
+        return rc != 0
+
+class SubCode:
+    # ENUM subcodes 1
+    (OK, PARAM_OUT_OF_RANGE, PARAM_NULL_PTR, PARAM_CONFLICT, INSUFFICIENT_SPACE, OUT_OF_RESOURCES, INTERNAL_ERROR, OUT_OF_MEMORY, PROTOCOL_ERROR, INIT_NOT_CALLED, TIMEOUT, KEEP_ALIVE_FAILURE, SESSION_NOT_ESTABLISHED, OS_ERROR, COMMUNICATION_ERROR, USER_DATA_TOO_LARGE, TOPIC_TOO_LARGE, INVALID_TOPIC_SYNTAX, XML_PARSE_ERROR, LOGIN_FAILURE, INVALID_VIRTUAL_ADDRESS, CLIENT_DELETE_IN_PROGRESS, TOO_MANY_CLIENTS, SUBSCRIPTION_ALREADY_PRESENT, SUBSCRIPTION_NOT_FOUND, SUBSCRIPTION_INVALID, SUBSCRIPTION_OTHER, CONTROL_OTHER, DATA_OTHER, LOG_FILE_ERROR, MESSAGE_TOO_LARGE, SUBSCRIPTION_TOO_MANY, INVALID_SESSION_OPERATION, TOPIC_MISSING, ASSURED_MESSAGING_NOT_ESTABLISHED, ASSURED_MESSAGING_STATE_ERROR, QUEUENAME_TOPIC_CONFLICT, QUEUENAME_TOO_LARGE, QUEUENAME_INVALID_MODE, MAX_TOTAL_MSGSIZE_EXCEEDED, DBLOCK_ALREADY_EXISTS, NO_STRUCTURED_DATA, CONTAINER_BUSY, INVALID_DATA_CONVERSION, CANNOT_MODIFY_WHILE_NOT_IDLE, MSG_VPN_NOT_ALLOWED, CLIENT_NAME_INVALID, MSG_VPN_UNAVAILABLE, CLIENT_USERNAME_IS_SHUTDOWN, DYNAMIC_CLIENTS_NOT_ALLOWED, CLIENT_NAME_ALREADY_IN_USE, CACHE_NO_DATA, CACHE_SUSPECT_DATA, CACHE_ERROR_RESPONSE, CACHE_INVALID_SESSION, CACHE_TIMEOUT, CACHE_LIVEDATA_FULFILL, CACHE_ALREADY_IN_PROGRESS, MISSING_REPLY_TO) = range(59)
+    
+    # ENUM subcodes 2
+    (INVALID_TOPIC_NAME_FOR_TE, INVALID_TOPIC_NAME_FOR_DTE, UNKNOWN_QUEUE_NAME, UNKNOWN_TE_NAME, UNKNOWN_DTE_NAME, MAX_CLIENTS_FOR_QUEUE, MAX_CLIENTS_FOR_TE, MAX_CLIENTS_FOR_DTE) = [ 60, 60, 61, 62, 62, 63, 64, 64 ]
+    
+    # ENUM subcodes 3
+    (UNEXPECTED_UNBIND, QUEUE_NOT_FOUND, CLIENT_ACL_DENIED, SUBSCRIPTION_ACL_DENIED, PUBLISH_ACL_DENIED, DELIVER_TO_ONE_INVALID, SPOOL_OVER_QUOTA, QUEUE_SHUTDOWN, TE_SHUTDOWN, NO_MORE_NON_DURABLE_QUEUE_OR_TE, ENDPOINT_ALREADY_EXISTS, PERMISSION_NOT_ALLOWED, INVALID_SELECTOR, MAX_MESSAGE_USAGE_EXCEEDED, ENDPOINT_PROPERTY_MISMATCH, SUBSCRIPTION_MANAGER_DENIED, UNKNOWN_CLIENT_NAME, QUOTA_OUT_OF_RANGE, SUBSCRIPTION_ATTRIBUTES_CONFLICT, INVALID_SMF_MESSAGE, NO_LOCAL_NOT_SUPPORTED, UNSUBSCRIBE_NOT_ALLOWED_CLIENTS_BOUND, CANNOT_BLOCK_IN_CONTEXT, FLOW_ACTIVE_FLOW_INDICATION_UNSUPPORTED, UNRESOLVED_HOST, CUT_THROUGH_UNSUPPORTED, CUT_THROUGH_ALREADY_BOUND, CUT_THROUGH_INCOMPATIBLE_WITH_SESSION, INVALID_FLOW_OPERATION, UNKNOWN_FLOW_NAME, REPLICATION_IS_STANDBY, LOW_PRIORITY_MSG_CONGESTION, LIBRARY_NOT_LOADED, FAILED_LOADING_TRUSTSTORE, UNTRUSTED_CERTIFICATE, UNTRUSTED_COMMONNAME, CERTIFICATE_DATE_INVALID, FAILED_LOADING_CERTIFICATE_AND_KEY, BASIC_AUTHENTICATION_IS_SHUTDOWN, CLIENT_CERTIFICATE_AUTHENTICATION_IS_SHUTDOWN, UNTRUSTED_CLIENT_CERTIFICATE, CLIENT_CERTIFICATE_DATE_INVALID, CACHE_REQUEST_CANCELLED, DELIVERY_MODE_UNSUPPORTED, PUBLISHER_NOT_CREATED, FLOW_UNBOUND, INVALID_TRANSACTED_SESSION_ID, INVALID_TRANSACTION_ID, MAX_TRANSACTED_SESSIONS_EXCEEDED, TRANSACTED_SESSION_NAME_IN_USE, SERVICE_UNAVAILABLE, NO_TRANSACTION_STARTED, PUBLISHER_NOT_ESTABLISHED, MESSAGE_PUBLISH_FAILURE, TRANSACTION_FAILURE, MESSAGE_CONSUME_FAILURE, ENDPOINT_MODIFIED, INVALID_CONNECTION_OWNER, KERBEROS_AUTHENTICATION_IS_SHUTDOWN, COMMIT_OR_ROLLBACK_IN_PROGRESS, UNBIND_RESPONSE_LOST, MAX_TRANSACTIONS_EXCEEDED, COMMIT_STATUS_UNKNOWN, PROXY_AUTH_REQUIRED, PROXY_AUTH_FAILURE, NO_SUBSCRIPTION_MATCH) = range(65,131)
+
+    _toString = _lib.solClient_subCodeToString
+    _toString.argtypes = [ c_int ]
+    _toString.restype = c_char_p
+
+    @classmethod
+    def toString(cls, subcode):
+        return cls._toString(subcode).decode()
+
+#########
+# Errors
+#########
+
+class SolaceError(Exception):
+    def __init__(self, rc, msg):
+        self.msg = msg
+        self.rc = rc
+        
+        info_p = getLastErrorInfo()
+        self.subCode = info_p.contents.subCode
+        self.responseCode = info_p.contents.responseCode
+        self.errorStr = info_p.contents.errorStr.decode()
+        self.trace = format_exc()
+
+        # format the message
+        message = '{} - ReturnCode="{}", SubCode="{}", ResponseCode={}, Info="{}"\n'.format(self.msg,
+                ReturnCode.toString(self.rc),
+                SubCode.toString(self.subCode),
+                self.responseCode, self.errorStr)
+
+        super().__init__(message)
+
+class LOG:
+    # ENUM log levels
+    (EMERGENCY, ALERT, CRITICAL, ERROR, WARNING, NOTICE, INFO, DEBUG) = range(8)
+
+    # ENUM log categories
+    (CATEGORY_ALL, CATEGORY_SDK, CATEGORY_APP) = range(3)
+    
+    _solClient_log_appFilterLevel_g = _in_dll(c_int, '_solClient_log_appFilterLevel_g')
+    _solClient_log_output_detail = _lib._solClient_log_output_detail
+    _solClient_log_output_detail.restype = None
+
+    # setFilter()
+    setFilterLevel = _lib.solClient_log_setFilterLevel
+    setFilterLevel.argypes = [ c_int, c_int ]
+    setFilterLevel.restype = c_int
+
+    # log()
+    @classmethod
+    def log(cls, level, formatStr):
+        if level <= cls._solClient_log_appFilterLevel_g.value:
+            trace = extract_stack(limit=2)[0]
+            filename = '/' + os.path.basename(trace.filename)
+            cls._solClient_log_output_detail(cls.CATEGORY_APP, level, 
+                    filename.encode(), trace.lineno, formatStr.encode())
+
+# printLastError()
+def printLastError(rc, errorStr):
+    info_p = getLastErrorInfo()
+    LOG.log ( LOG.ERROR,
+            '{} - ReturnCode="{}", SubCode="{}", ResponseCode={}, Info="{}"\n'.format(errorStr,
+                ReturnCode.toString(rc),
+                SubCode.toString(info_p.contents.subCode),
+                info_p.contents.responseCode,
+                info_p.contents.errorStr.decode()) )
+
+    _lib.solClient_resetLastErrorInfo()
+
+############
+# Properties
+############
+
+"""
+_Properties class ensure only the symbolic property names get set via __setattr__().
+Translation from symbolic property names to actual values get defined in the respective subclasses.
+Actual translation happens at toCPropsArray and back.
+The C array is compiled once and cached until a property is set or deleted.
+"""
+class _MetaProperties(type):
+    def __init__(cls, name, bases, d):
+        type.__init__(cls, name, bases, d)
+        cls._rdict = {}
+        for k, v in vars(cls).items():
+            if type(v) is str:
+                cls._rdict[v] = k
+
+class _Properties(metaclass=_MetaProperties):
+    def __init__(self, iterable=None, **kwargs):
+        if iterable:
+            for k, v in iterable:
+                setattr(self, k, v)
+        for k, v in kwargs.items():
+            setattr(self, k, v)
+
+    def __setattr__(self, k, v):
+        if not k in vars(type(self)).keys():
+            raise AttributeError('Property {} does not exist'.format(k))
+        self.__dict__[k] = v
+        self.__dict__.pop('_cprops', None)
+
+    def __delattr__(self, k):
+        super().__delattr__(k)
+        self.__dict__.pop('_cprops', None)
+
+    def _props(self):
+        return { k: v for k, v in vars(self).items() if k[0] != '_' }
+
+    def toCPropsArray(self):
+        props = self.__dict__.get('_cprops')
+        if props is None:
+            props = self._compileCPropsArray()
+            self.__dict__['_cprops'] = props
+        return props
+
+    def _compileCPropsArray(self):
+        # one-liner magic is actually slower, verified with timeit!
+        #
+        #props = (c_char_p * (2 * len(vars(self)) + 1))(
+        #        *list(map(_toBytes, chain.from_iterable(vars(self)))), None)
+
+        d = self._props()
+        def iterProps(d):
+            for k, v in d.items():
+                yield _toBytes(getattr(type(self), k))
+                yield _toBytes(v)
+                
+        props = (c_char_p * (2 * len(d) + 1))( \
+                *list(iterProps(d)), None)
+        return props
+
+    @classmethod
+    def _iterProps(cls, p):
+        for idx in range(0, len(p)-1, 2):
+            yield (cls._rdict[p[idx].decode()], p[idx+1].decode())
+
+    def loadCPropsArray(self, props):
+        # one-liner magic is actually slower, verified with timeit!
+        #
+        #return cls( zip_longest(
+        #    *([ iter( map(lambda b: b.decode(), props[:-1])) ] * 2)))
+        for k, v in self._iterProps(props):
+            setattr(self, k, v)
+
+
+class ContextProperties(_Properties):
+    _defaults = None
+
+    def __init__(self, args=None, **kw):
+        if args or kw:
+            super().__init__(args, **kw)
+        else:
+            super().__init__(self._defaultProps())
+
+    @classmethod
+    def _defaultProps(cls):
+        # probed and decoded once per process
+        if ContextProperties._defaults is None:
+            propLen = 1
+            lastProp = 1
+            while lastProp is not None:
+                props_t = c_char_p * propLen
+                props = props_t.in_dll(_library(), '_solClient_contextPropsDefaultWithCreateThread')
+                lastProp = props[-1]
+                propLen += 2
+            ContextProperties._defaults = list(cls._iterProps(props))
+        return ContextProperties._defaults
+
+    # context property defines
+    TIME_RES_MS = "CONTEXT_TIME_RES_MS"
+    CREATE_THREAD = "CONTEXT_CREATE_THREAD"
+    THREAD_AFFINITY = "CONTEXT_THREAD_AFFINITY"
+    DEFAULT_TIME_RES_MS = "50"
+    DEFAULT_CREATE_THREAD = PROP_DISABLE_VAL
+    DEFAULT_THREAD_AFFINITY = "0"
+
+class SessionProperties(_Properties):
+    ACK_EVENT_MODE_PER_MSG = "SESSION_ACK_EVENT_MODE_PER_MSG"
+    ACK_EVENT_MODE_WINDOWED = "SESSION_ACK_EVENT_MODE_WINDOWED"
+    USERNAME = "SESSION_USERNAME"
+    PASSWORD = "SESSION_PASSWORD"
+    HOST = "SESSION_HOST"
+    PORT = "SESSION_PORT"
+    BUFFER_SIZE = "SESSION_BUFFER_SIZE"
+    CONNECT_BLOCKING = "SESSION_CONNECT_BLOCKING"
+    SEND_BLOCKING = "SESSION_SEND_BLOCKING"
+    SUBSCRIBE_BLOCKING = "SESSION_SUBSCRIBE_BLOCKING"
+    BLOCK_WHILE_CONNECTING = "SESSION_BLOCK_WHILE_CONNECTING"
+    BLOCKING_WRITE_TIMEOUT_MS = "SESSION_WRITE_TIMEOUT_MS"
+    CONNECT_TIMEOUT_MS = "SESSION_CONNECT_TIMEOUT_MS"
+    SUBCONFIRM_TIMEOUT_MS = "SESSION_SUBCONFIRM_TIMEOUT_MS"
+    IGNORE_DUP_SUBSCRIPTION_ERROR = "SESSION_IGNORE_DUP_SUBSCRIPTION_ERROR"
+    TCP_NODELAY = "SESSION_TCP_NODELAY"
+    SOCKET_SEND_BUF_SIZE = "SESSION_SOCKET_SEND_BUF_SIZE"
+    SOCKET_RCV_BUF_SIZE = "SESSION_SOCKET_RCV_BUF_SIZE"
+    KEEP_ALIVE_INT_MS = "SESSION_KEEP_ALIVE_INTERVAL_MS"
+    KEEP_ALIVE_LIMIT = "SESSION_KEEP_ALIVE_LIMIT"
+    APPLICATION_DESCRIPTION = "SESSION_APPLICATION_DESCRIPTION"
+    CLIENT_MODE = "SESSION_CLIENT_MODE"
+    BIND_IP = "SESSION_BIND_IP"
+    PUB_WINDOW_SIZE = "SESSION_PUB_WINDOW_SIZE"
+    PUB_ACK_TIMER = "SESSION_PUB_ACK_TIMER"
+    VPN_NAME = "SESSION_VPN_NAME"
+    VPN_NAME_IN_USE = "SESSION_VPN_NAME_IN_USE"
+    CLIENT_NAME = "SESSION_CLIENT_NAME"
+    SUBSCRIBER_LOCAL_PRIORITY = "SESSION_SUBSCRIBER_LOCAL_PRIORITY"
+    SUBSCRIBER_NETWORK_PRIORITY = "SESSION_SUBSCRIBER_NETWORK_PRIORITY"
+    COMPRESSION_LEVEL = "SESSION_COMPRESSION_LEVEL"
+    GENERATE_RCV_TIMESTAMPS = "SESSION_RCV_TIMESTAMP"
+    GENERATE_SEND_TIMESTAMPS = "SESSION_SEND_TIMESTAMP"
+    GENERATE_SENDER_ID = "SESSION_SEND_SENDER_ID"
+    GENERATE_SEQUENCE_NUMBER = "SESSION_SEND_SEQUENCE_NUMBER"
+    CONNECT_RETRIES_PER_HOST = "SESSION_CONNECT_RETRIES_PER_HOST"
+    CONNECT_RETRIES = "SESSION_CONNECT_RETRIES"
+    RECONNECT_RETRIES = "SESSION_RECONNECT_RETRIES"
+    RECONNECT_RETRY_WAIT_MS = "SESSION_RECONNECT_RETRY_WAIT_MS"
+    USER_ID = "SESSION_USER_ID"
+    P2PINBOX_IN_USE = "SESSION_REPLY_TO_DEFAULT_DEST"
+    REPLY_TO_DEFAULT_DEST = P2PINBOX_IN_USE
+    REAPPLY_SUBSCRIPTIONS = "SESSION_REAPPLY_SUBSCRIPTIONS"
+    TOPIC_DISPATCH = "SESSION_TOPIC_DISPATCH"
+    PROVISION_TIMEOUT_MS = "SESSION_PROVISION_TIMEOUT_MS"
+    CALCULATE_MESSAGE_EXPIRATION = "SESSION_CALCULATE_MESSAGE_EXPIRATION"
+    VIRTUAL_ROUTER_NAME = "SESSION_VIRTUAL_ROUTER_NAME"
+    NO_LOCAL = "SESSION_NO_LOCAL"
+    AD_PUB_ROUTER_WINDOWED_ACK = "SESSION_AD_PUB_ROUTER_WINDOWED_ACK"
+    MODIFYPROP_TIMEOUT_MS = "SESSION_MODIFYPROP_TIMEOUT_MS"
+    ACK_EVENT_MODE = "SESSION_ACK_EVENT_MODE"
+    SSL_EXCLUDED_PROTOCOLS = "SESSION_SSL_EXCLUDED_PROTOCOLS"
+    SSL_VALIDATE_CERTIFICATE = "SESSION_SSL_VALIDATE_CERTIFICATE"
+    SSL_CLIENT_CERTIFICATE_FILE = "SESSION_SSL_CLIENT_CERTIFICATE_FILE"
+    SSL_CLIENT_PRIVATE_KEY_FILE = "SESSION_SSL_CLIENT_PRIVATE_KEY_FILE"
+    SSL_CLIENT_PRIVATE_KEY_FILE_PASSWORD = "SESSION_SSL_CLIENT_PRIVATE_KEY_FILE_PASSWORD"
+    SSL_CONNECTION_DOWNGRADE_TO = "SESSION_SSL_CONNECTION_DOWNGRADE_TO"
+    AUTHENTICATION_SCHEME = "SESSION_AUTHENTICATION_SCHEME"
+    KRB_SERVICE_NAME = "SESSION_KRB_SERVICE_NAME"
+    UNBIND_FAIL_ACTION = "SESSION_UNBIND_FAIL_ACTION"
+    WEB_TRANSPORT_PROTOCOL = ("SESSION_WEB_TRANSPORT_PROTOCOL")
+    WEB_TRANSPORT_PROTOCOL_IN_USE = ("SESSION_WEB_TRANSPORT_PROTOCOL_IN_USE")
+    WEB_TRANSPORT_PROTOCOL_LIST = ("SESSION_WEB_TRANSPORT_PROTOCOL_LIST")
+    TRANSPORT_PROTOCOL_DOWNGRADE_TIMEOUT_MS = ("SESSION_TRANSPORT_PROTOCOL_DOWNGRADE_TIMEOUT_MS")
+    GD_RECONNECT_FAIL_ACTION = "SESSION_GD_RECONNECT_FAIL_ACTION"
+    AUTHENTICATION_SCHEME_BASIC = "AUTHENTICATION_SCHEME_BASIC"
+    AUTHENTICATION_SCHEME_CLIENT_CERTIFICATE = "AUTHENTICATION_SCHEME_CLIENT_CERTIFICATE"
+    AUTHENTICATION_SCHEME_GSS_KRB = "AUTHENTICATION_SCHEME_GSS_KRB"
+    UNBIND_FAIL_ACTION_RETRY = "UNBIND_FAIL_ACTION_RETRY"
+    UNBIND_FAIL_ACTION_DISCONNECT = "UNBIND_FAIL_ACTION_DISCONNECT"
+    SSL_VALIDATE_CERTIFICATE_DATE = "SESSION_SSL_VALIDATE_CERTIFICATE_DATE"
+    SSL_CIPHER_SUITES = "SESSION_SSL_CIPHER_SUITES"
+    SSL_TRUST_STORE_DIR = "SESSION_SSL_TRUST_STORE_DIR"
+    SSL_TRUSTED_COMMON_NAME_LIST = "SESSION_SSL_TRUSTED_COMMON_NAME_LIST"
+    GD_RECONNECT_FAIL_ACTION_AUTO_RETRY = ("GD_RECONNECT_FAIL_ACTION_AUTO_RETRY")
+    GD_RECONNECT_FAIL_ACTION_DISCONNECT = ("GD_RECONNECT_FAIL_ACTION_DISCONNECT")
+    SSL_CIPHER_ECDHE_RSA_AES256_GCM_SHA384 = ("ECDHE-RSA-AES256-GCM-SHA384")
+    SSL_CIPHER_TLS_ECDHE_RSA_WITH_AES_256_GCM_SHA384 = ("TLS_ECDHE_RSA_WITH_AES_256_GCM_SHA384")
+    SSL_CIPHER_ECDHE_RSA_AES256_SHA384 = ("ECDHE-RSA-AES256-SHA384")
+    SSL_CIPHER_TLS_ECDHE_RSA_WITH_AES_256_CBC_SHA384 = ("TLS_ECDHE_RSA_WITH_AES_256_CBC_SHA384")
+    SSL_CIPHER_ECDHE_RSA_AES256_SHA = ("ECDHE-RSA-AES256-SHA")
+    SSL_CIPHER_TLS_ECDHE_RSA_WITH_AES_256_CBC_SHA = ("TLS_ECDHE_RSA_WITH_AES_256_CBC_SHA")
+    SSL_CIPHER_AES256_GCM_SHA384 = ("AES256-GCM-SHA384")
+    SSL_CIPHER_TLS_RSA_WITH_AES_256_GCM_SHA384 = ("TLS_RSA_WITH_AES_256_GCM_SHA384")
+    SSL_CIPHER_AES256_SHA256 = ("AES256-SHA256")
+    SSL_CIPHER_TLS_RSA_WITH_AES_256_CBC_SHA256 = ("TLS_RSA_WITH_AES_256_CBC_SHA256")
+    SSL_CIPHER_AES256_SHA = ("AES256-SHA")
+    SSL_CIPHER_TLS_RSA_WITH_AES_256_CBC_SHA = ("TLS_RSA_WITH_AES_256_CBC_SHA")
+    SSL_CIPHER_ECDHE_RSA_DES_CBC3_SHA = ("ECDHE-RSA-DES-CBC3-SHA")
+    SSL_CIPHER_TLS_ECDHE_RSA_WITH_3DES_EDE_CBC_SHA = ("TLS_ECDHE_RSA_WITH_3DES_EDE_CBC_SHA")
+    SSL_CIPHER_DES_CBC3_SHA = ("DES-CBC3-SHA")
+    SSL_CIPHER_SSL_RSA_WITH_3DES_EDE_CBC_SHA = ("SSL_RSA_WITH_3DES_EDE_CBC_SHA")
+    SSL_CIPHER_ECDHE_RSA_AES128_GCM_SHA256 = ("ECDHE-RSA-AES128-GCM-SHA256")
+    SSL_CIPHER_TLS_ECDHE_RSA_WITH_AES_128_GCM_SHA256 = ("TLS_ECDHE_RSA_WITH_AES_128_GCM_SHA256")
+    SSL_CIPHER_ECDHE_RSA_AES128_SHA256 = ("ECDHE-RSA-AES128-SHA256")
+    SSL_CIPHER_TLS_ECDHE_RSA_WITH_AES_128_CBC_SHA256 = ("TLS_ECDHE_RSA_WITH_AES_128_CBC_SHA256")
+    SSL_CIPHER_ECDHE_RSA_AES128_SHA = ("ECDHE-RSA-AES128-SHA")
+    SSL_CIPHER_TLS_ECDHE_RSA_WITH_AES_128_CBC_SHA = ("TLS_ECDHE_RSA_WITH_AES_128_CBC_SHA")
+    SSL_CIPHER_AES128_GCM_SHA256 = ("AES128-GCM-SHA256")
+    SSL_CIPHER_TLS_RSA_WITH_AES_128_GCM_SHA256 = ("TLS_RSA_WITH_AES_128_GCM_SHA256")
+    SSL_CIPHER_AES128_SHA256 = ("AES128-SHA256")
+    SSL_CIPHER_TLS_RSA_WITH_AES_128_CBC_SHA256 = ("TLS_RSA_WITH_AES_128_CBC_SHA256")
+    SSL_CIPHER_AES128_SHA = ("AES128-SHA")
+    SSL_CIPHER_TLS_RSA_WITH_AES_128_CBC_SHA = ("TLS_RSA_WITH_AES_128_CBC_SHA")
+    SSL_CIPHER_RC4_SHA = ("RC4-SHA")
+    SSL_CIPHER_SSL_RSA_WITH_RC4_128_SHA = ("SSL_RSA_WITH_RC4_128_SHA")
+    SSL_CIPHER_RC4_MD5 = ("RC4-MD5")
+    SSL_CIPHER_SSL_RSA_WITH_RC4_128_MD5 = ("SSL_RSA_WITH_RC4_128_MD5")
+    SSL_PROTOCOL_TLSV1_2 = ("TLSv1.2")
+    SSL_PROTOCOL_TLSV1_1 = ("TLSv1.1")
+    SSL_PROTOCOL_TLSV1 = ("TLSv1")
+    SSL_PROTOCOL_SSLV3 = ("SSLv3")
+    MAX_USERNAME_LEN = (189)
+    MAX_PASSWORD_LEN = (128)
+    MAX_HOSTS = (16)
+    MAX_APP_DESC = (255)
+    MAX_CLIENT_NAME_LEN = (160)
+    MAX_VPN_NAME_LEN = (32)
+    MAX_VIRTUAL_ROUTER_NAME_LEN = (52)
+    DEFAULT_USERNAME = ""
+    DEFAULT_PASSWORD = ""
+    DEFAULT_HOST = "127.0.0.1"
+    DEFAULT_PORT = "55555"
+    DEFAULT_PORT_COMPRESSION = "55003"
+    DEFAULT_PORT_SSL = "55443"
+    DEFAULT_BUFFER_SIZE = "90000"
+    DEFAULT_CONNECT_BLOCKING = PROP_ENABLE_VAL
+    DEFAULT_SEND_BLOCKING = PROP_ENABLE_VAL
+    DEFAULT_SUBSCRIBE_BLOCKING = PROP_ENABLE_VAL
+    DEFAULT_BLOCK_WHILE_CONNECTING = PROP_ENABLE_VAL
+    DEFAULT_BLOCKING_WRITE_TIMEOUT_MS = "100000"
+    DEFAULT_CONNECT_TIMEOUT_MS = "30000"
+    DEFAULT_SUBCONFIRM_TIMEOUT_MS = "10000"
+    DEFAULT_IGNORE_DUP_SUBSCRIPTION_ERROR = PROP_ENABLE_VAL
+    DEFAULT_TCP_NODELAY = PROP_ENABLE_VAL
+    DEFAULT_SOCKET_SEND_BUF_SIZE = "90000"
+    DEFAULT_SOCKET_RCV_BUF_SIZE = "150000"
+    DEFAULT_KEEP_ALIVE_INT_MS = "3000"
+    DEFAULT_KEEP_ALIVE_LIMIT = "3"
+    DEFAULT_APPLICATION_DESCRIPTION = ""
+    DEFAULT_CLIENT_MODE = PROP_DISABLE_VAL
+    DEFAULT_BIND_IP = ""
+    DEFAULT_PUB_ACK_TIMER = "2000"
+    DEFAULT_PUB_WINDOW_SIZE = "50"
+    DEFAULT_VPN_NAME = ""
+    DEFAULT_CLIENT_NAME = ""
+    DEFAULT_SUBSCRIBER_LOCAL_PRIORITY = "1"
+    DEFAULT_SUBSCRIBER_NETWORK_PRIORITY = "1"
+    DEFAULT_COMPRESSION_LEVEL = "0"
+    DEFAULT_GENERATE_RCV_TIMESTAMPS = PROP_DISABLE_VAL
+    DEFAULT_GENERATE_SEND_TIMESTAMPS = PROP_DISABLE_VAL
+    DEFAULT_GENERATE_SENDER_ID = PROP_DISABLE_VAL
+    DEFAULT_GENERATE_SEQUENCE_NUMBER = PROP_DISABLE_VAL
+    DEFAULT_CONNECT_RETRIES_PER_HOST = "0"
+    DEFAULT_CONNECT_RETRIES = "0"
+    DEFAULT_RECONNECT_RETRIES = "0"
+    DEFAULT_RECONNECT_RETRY_WAIT_MS = "3000"
+    DEFAULT_REAPPLY_SUBSCRIPTIONS = PROP_DISABLE_VAL
+    DEFAULT_TOPIC_DISPATCH = PROP_DISABLE_VAL
+    DEFAULT_PROVISION_TIMEOUT_MS = "3000"
+    DEFAULT_MODIFYPROP_TIMEOUT_MS = "10000"
+    DEFAULT_CALCULATE_EXPIRATION_TIME = PROP_DISABLE_VAL
+    DEFAULT_NO_LOCAL = PROP_DISABLE_VAL
+    DEFAULT_AD_PUB_ROUTER_WINDOWED_ACK = PROP_ENABLE_VAL
+    DEFAULT_SSL_EXCLUDED_PROTOCOLS = ""
+    DEFAULT_SSL_VALIDATE_CERTIFICATE = PROP_ENABLE_VAL
+    DEFAULT_SSL_VALIDATE_CERTIFICATE_DATE = PROP_ENABLE_VAL
+    DEFAULT_SSL_CIPHER_SUITES = ("ECDHE-RSA-AES256-GCM-SHA384,ECDHE-RSA-AES256-SHA384,ECDHE-RSA-AES256-SHA,AES256-GCM-SHA384,AES256-SHA256,AES256-SHA,ECDHE-RSA-DES-CBC3-SHA,DES-CBC3-SHA,ECDHE-RSA-AES128-GCM-SHA256,ECDHE-RSA-AES128-SHA256,ECDHE-RSA-AES128-SHA,AES128-GCM-SHA256,AES128-SHA256,AES128-SHA,RC4-SHA,RC4-MD5")
+    DEFAULT_AUTHENTICATION_SCHEME = AUTHENTICATION_SCHEME_BASIC
+    DEFAULT_KRB_SERVICE_NAME = "solace"
+    DEFAULT_UNBIND_FAIL_ACTION = UNBIND_FAIL_ACTION_RETRY
+    DEFAULT_WEB_TRANSPORT_PROTOCOL = SOLCLIENT_TRANSPORT_PROTOCOL_NULL
+    DEFAULT_TRANSPORT_PROTOCOL_DOWNGRADE_TIMEOUT_MS = ("3000")
+    DEFAULT_GD_RECONNECT_FAIL_ACTION = GD_RECONNECT_FAIL_ACTION_AUTO_RETRY
+
+class TransactedSessionProperties(_Properties):
+    HAS_PUBLISHER = "TRANSACTEDSESSION_HAS_PUBLISHER"
+    CREATE_MESSAGE_DISPATCHER = "TRANSACTEDSESSION_CREATE_MESSAGE_DISPATCHER"
+    REQUESTREPLY_TIMEOUT_MS = "TRANSACTEDSESSION_REQUESTREPLY_TIMEOUT_MS"
+    DEFAULT_HAS_PUBLISHER = PROP_ENABLE_VAL
+    DEFAULT_CREATE_MESSAGE_DISPATCHER = PROP_DISABLE_VAL
+    DEFAULT_REQUESTREPLY_TIMEOUT_MS = "10000"
+
+class FlowProperties(_Properties):
+    BIND_BLOCKING = "FLOW_BIND_BLOCKING" 
+    BIND_TIMEOUT_MS = "FLOW_BIND_TIMEOUT_MS" 
+    BIND_ENTITY_ID = "FLOW_BIND_ENTITY_ID" 
+    BIND_ENTITY_DURABLE = "FLOW_BIND_ENTITY_DURABLE" 
+    BIND_NAME = "FLOW_BIND_NAME" 
+    WINDOWSIZE = "FLOW_WINDOWSIZE" 
+    AUTOACK = "FLOW_AUTOACK" 
+    ACKMODE = "FLOW_ACKMODE" 
+    TOPIC = "FLOW_TOPIC" 
+    MAX_BIND_TRIES = "FLOW_MAX_BIND_TRIES" 
+    ACK_TIMER_MS = "FLOW_ACK_TIMER_MS" 
+    ACK_THRESHOLD = "FLOW_ACK_THRESHOLD" 
+    START_STATE = "FLOW_START_STATE" 
+    SELECTOR = "FLOW_SELECTOR" 
+    NO_LOCAL = "FLOW_NO_LOCAL" 
+    FORWARDING_MODE = "FLOW_FORWARDING_MODE" 
+    MAX_UNACKED_MESSAGES = "FLOW_MAX_UNACKED_MESSAGES" 
+    BROWSER = "FLOW_BROWSER" 
+    ACTIVE_FLOW_IND = "FLOW_ACTIVE_FLOW_IND" 
+    BIND_ENTITY_SUB = "1" 
+    BIND_ENTITY_QUEUE = "2" 
+    BIND_ENTITY_TE = "3" 
+    BIND_ENTITY_DTE = BIND_ENTITY_TE 
+    ACKMODE_AUTO = "1" 
+    ACKMODE_CLIENT = "2" 
+    FORWARDING_MODE_STORE_AND_FORWARD = "1" 
+    FORWARDING_MODE_CUT_THROUGH = "2" 
+    DEFAULT_BIND_BLOCKING = PROP_ENABLE_VAL 
+    DEFAULT_BIND_TIMEOUT_MS = "10000" 
+    DEFAULT_BIND_ENTITY_ID = BIND_ENTITY_SUB 
+    DEFAULT_BIND_ENTITY_DURABLE = PROP_ENABLE_VAL 
+    DEFAULT_BIND_NAME = "" 
+    DEFAULT_WINDOWSIZE = "255" 
+    DEFAULT_AUTOACK = PROP_ENABLE_VAL 
+    DEFAULT_TOPIC = "" 
+    DEFAULT_MAX_BIND_TRIES = "3" 
+    DEFAULT_ACK_TIMER_MS = "1000" 
+    DEFAULT_ACK_THRESHOLD = "60" 
+    DEFAULT_START_STATE = PROP_ENABLE_VAL 
+    DEFAULT_SELECTOR = "" 
+    DEFAULT_NO_LOCAL = PROP_DISABLE_VAL 
+    DEFAULT_FORWARDING_MODE = FORWARDING_MODE_STORE_AND_FORWARD 
+    DEFAULT_MAX_UNACKED_MESSAGES = "-1" 
+    DEFAULT_BROWSER = PROP_DISABLE_VAL 
+    DEFAULT_ACTIVE_FLOW_IND = PROP_DISABLE_VAL 
+
+class EndpointProperties(_Properties):
+    ID = "ENDPOINT_ID" 
+    NAME = "ENDPOINT_NAME" 
+    DURABLE = "ENDPOINT_DURABLE" 
+    PERMISSION = "ENDPOINT_PERMISSION" 
+    ACCESSTYPE = "ENDPOINT_ACCESSTYPE" 
+    QUOTA_MB = "ENDPOINT_QUOTA_MB" 
+    MAXMSG_SIZE = "ENDPOINT_MAXMSG_SIZE" 
+    RESPECTS_MSG_TTL = "ENDPOINT_RESPECTS_MSG_TTL" 
+    DISCARD_BEHAVIOR = "ENDPOINT_DISCARD_BEHAVIOR" 
+    MAXMSG_REDELIVERY = "ENDPOINT_MAXMSG_REDELIVERY" 
+    QUEUE = "2" 
+    TE = "3" 
+    CLIENT_NAME = "4" 
+    ACCESSTYPE_NONEXCLUSIVE = "0" 
+    ACCESSTYPE_EXCLUSIVE = "1" 
+    DISCARD_NOTIFY_SENDER_ON = "1" 
+    DISCARD_NOTIFY_SENDER_OFF = "2" 
+    DEFAULT_ID = TE 
+    DEFAULT_DURABLE = PROP_ENABLE_VAL 
+    DEFAULT_RESPECTS_MSG_TTL = PROP_DISABLE_VAL 
+    PERM_NONE = "n"
+    PERM_READ_ONLY = "r"
+    PERM_CONSUME = "c"
+    PERM_MODIFY_TOPIC = "m"
+    PERM_DELETE = "d"
+
+class CacheSessionProperties(_Properties):
+    CACHE_NAME = "CACHESESSION_CACHE_NAME" 
+    MAX_MSGS = "CACHESESSION_MAX_MSGS" 
+    MAX_AGE = "CACHESESSION_MAX_AGE" 
+    REQUESTREPLY_TIMEOUT_MS = "CACHESESSION_RR_TIMEOUT_MS" 
+    REPLY_TO = "CACHESESSION_REPLY_TO" 
+    DEFAULT_CACHE_NAME = "" 
+    DEFAULT_MAX_MSGS = "1" 
+    DEFAULT_MAX_AGE = "0" 
+    DEFAULT_REQUESTREPLY_TIMEOUT_MS = "10000" 
+    DEFAULT_REPLY_TO = "" 
+
+##############
+# ContextInfo
+##############
+
+class ContextFuncInfo(Structure):
+    class RegFDFuncInfo(Structure):
+        FD_CALLBACK_FUNC = CFUNCTYPE( None, c_void_p, c_int, c_uint32, c_void_p )
+        REG_FD_FUNC = CFUNCTYPE( c_int, c_void_p, c_int, c_uint32, FD_CALLBACK_FUNC, c_void_p )
+        UNREG_FD_FUNC = CFUNCTYPE( c_int, c_void_p, c_int, c_uint32 )
+
+        _fields_ = [    ('regFdFuncInfo', REG_FD_FUNC),
+                        ('unregFdFuncInfo', UNREG_FD_FUNC),
+                        ('user_p', c_void_p) ]
+
+    _fields_ = [ ('regFdInfo', RegFDFuncInfo) ]
+
+###########
+# Context
+###########
+
+class Context:
+    def __init__(self, props = None, funcInfo = None):
+        if props is None:
+            props = ContextProperties()
+        if funcInfo is None:
+            self.contextFuncInfo = ContextFuncInfo()
+        else:
+            self.contextFuncInfo = funcInfo
+
+        self._pt = c_void_p()
+        
+        rc = _lib.solClient_context_create(
+                props.toCPropsArray(), byref(self._pt),
+                pointer(self.contextFuncInfo), sizeof(self.contextFuncInfo))
+
+        if rc != ReturnCode.OK:
+            raise SolaceError(rc, "context.create")
+
+    def __del__(self):
+        rc = _lib.solClient_context_destroy(byref(self._pt))
+
+        if rc != ReturnCode.OK:
+            printLastError(rc, "context.destroy")
+
+"""
+AsyncioContext lets an asyncio event loop drive the context instead of an
+internal thread. The library registers its sockets through regFdFuncInfo,
+which are watched with loop.add_reader/add_writer, and its timers are driven
+by solClient_context_timerTick() from loop.call_later. All message and event
+callbacks run on the loop thread.
+
+Create and use it from the loop thread only, within the running loop unless
+loop is given, and give its sessions non-blocking connect, send and
+subscribe properties.
+"""
+class AsyncioContext(Context):
+    (FD_EVENT_READ, FD_EVENT_WRITE) = (0x01, 0x02)
+
+    _timerTick = _lib.solClient_context_timerTick
+    _timerTick.argtypes = [c_void_p]
+    _timerTick.restype  = c_int
+    _timerTick.errcheck = ReturnCode.raiseNotOK
+    def __init__(self, loop=None, props=None):
+        import asyncio
+
+        # what close() needs, should anything below raise
+        self._pt = c_void_p()
+        # fd -> { FD_EVENT_*: (callback, user_p) }
+        self._fds = {}
+        self._timer = None
+
+        self.loop = loop or asyncio.get_running_loop()
+        props = ContextProperties() if props is None else type(props)(props._props().items())
+        props.CREATE_THREAD = PROP_DISABLE_VAL
+        self._tickSec = int(props._props().get('TIME_RES_MS', ContextProperties.DEFAULT_TIME_RES_MS)) / 1000.0
+
+        # keep the C callbacks alive for the lifetime of the context
+        RegFD = ContextFuncInfo.RegFDFuncInfo
+        self._regFdFunc = RegFD.REG_FD_FUNC(self._regFd)
+        self._unregFdFunc = RegFD.UNREG_FD_FUNC(self._unregFd)
+
+        funcInfo = ContextFuncInfo()
+        funcInfo.regFdInfo.regFdFuncInfo = self._regFdFunc
+        funcInfo.regFdInfo.unregFdFuncInfo = self._unregFdFunc
+
+        # the loop only holds weak references, so an unreferenced context is freed
+        self._weakDispatch = self._weak(self._dispatch)
+        self._weakTick = self._weak(self._tick)
+
+        super().__init__(props, funcInfo)
+        self._timer = self.loop.call_later(self._tickSec, self._weakTick)
+
+    @staticmethod
+    def _weak(method):
+        ref = weakref.WeakMethod(method)
+        def call(*args):
+            m = ref()
+            if m is not None:
+                m(*args)
+        return call
+
+    def _regFd(self, app_p, fd, events, callback, user_p):
+        handlers = self._fds.setdefault(fd, {})
+        for event in (self.FD_EVENT_READ, self.FD_EVENT_WRITE):
+            if not events & event:
+                continue
+            handlers[event] = (callback, user_p)
+            if event == self.FD_EVENT_READ:
+                self.loop.add_reader(fd, self._weakDispatch, fd, event)
+            else:
+                self.loop.add_writer(fd, self._weakDispatch, fd, event)
+        return ReturnCode.OK
+
+    def _unregFd(self, app_p, fd, events):
+        handlers = self._fds.get(fd, {})
+        for event in (self.FD_EVENT_READ, self.FD_EVENT_WRITE):
+            if not events & event or handlers.pop(event, None) is None:
+                continue
+            if event == self.FD_EVENT_READ:
+                self.loop.remove_reader(fd)
+            else:
+                self.loop.remove_writer(fd)
+        if not handlers:
+            self._fds.pop(fd, None)
+        return ReturnCode.OK
+
+    def _dispatch(self, fd, event):
+        handler = self._fds.get(fd, {}).get(event)
+        if handler is not None:
+            callback, user_p = handler
+            callback(self._pt, fd, event, user_p)
+
+    def _tick(self):
+        try:
+            self._timerTick(self._pt)
+        except SolaceError as e:
+            LOG.log( LOG.ERROR, str(e) )
+            _lib.solClient_resetLastErrorInfo()
+        self._timer = self.loop.call_later(self._tickSec, self._weakTick)
+
+    def close(self):
+        # stop driving the context and destroy it
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for fd, handlers in list(self._fds.items()):
+            if self.FD_EVENT_READ in handlers:
+                self.loop.remove_reader(fd)
+            if self.FD_EVENT_WRITE in handlers:
+                self.loop.remove_writer(fd)
+        self._fds.clear()
+
+        if self._pt:
+            super().__del__()
+            self._pt = c_void_p()
+
+    def __del__(self):
+        self.close()
+
+################
+# Callbacks
+################
+
+MSG_CALLBACK_TYPE = CFUNCTYPE(c_int, c_void_p, c_void_p, c_void_p)
+
+def _defaultMsgCallback( session_p, msg_p, user_p ):
+    Message.dumpPtr(msg_p)
+    return CALLBACK_OK
+
+class EventCallbackInfo(Structure):
+    _fields_ = [ \
+                    ('sessionEvent', c_int),
+                    ('responseCode', c_uint32),
+                    ('info_p', c_char_p),
+                    ('correlation_p', c_void_p) ]
+
+EVENT_CALLBACK_TYPE = CFUNCTYPE(None, c_void_p, POINTER(EventCallbackInfo), c_void_p)
+
+def _defaultEventCallback( session_p, eventInfo_p, user_p ):
+    event = eventInfo_p.contents.sessionEvent
+
+    if event == SessionEvent.UP_NOTICE or \
+        event == SessionEvent.ACKNOWLEDGEMENT or \
+        event == SessionEvent.TE_UNSUBSCRIBE_OK or \
+        event == SessionEvent.CAN_SEND or \
+        event == SessionEvent.RECONNECTING_NOTICE or \
+        event == SessionEvent.RECONNECTED_NOTICE or \
+        event == SessionEvent.PROVISION_OK or \
+        event == SessionEvent.SUBSCRIPTION_OK:
+
+            LOG.log(LOG.INFO, '_defaultEventCallback - {}\n'.format(
+                SessionEvent.toString(event)))
+
+    elif event == SessionEvent.DOWN_ERROR or \
+        event == SessionEvent.CONNECT_FAILED_ERROR or \
+        event == SessionEvent.REJECTED_MSG_ERROR or \
+        event == SessionEvent.SUBSCRIPTION_ERROR or \
+        event == SessionEvent.RX_MSG_TOO_BIG_ERROR or \
+        event == SessionEvent.TE_UNSUBSCRIBE_ERROR or \
+        event == SessionEvent.PROVISION_ERROR:
+
+            info_p = getLastErrorInfo()
+            
+            LOG.log(LOG.ERROR,
+                    '_defaultEventCallback - {}; subCode {}, responseCode {}, reason {}\n'.format(
+                        SessionEvent.toString(event),
+                        SubCode.toString( info_p.contents.subCode ),
+                        info_p.contents.responseCode,
+                        info_p.contents.errorStr.decode()) )
+    
+    else:
+        LOG.log(LOG.ERROR,
+                '_defaultEventCallback - {}; Unrecognized or deprecated event.\n'.format(
+                    SessionEvent.toString(event)))
+
+"""
+TopicRouter dispatches received messages to handlers by subscription
+pattern, with Solace wildcards: a level of "*" matches any one level,
+"abc*" any level starting with "abc", and a final ">" one or more levels.
+Patterns live in a trie; the handlers matching a concrete topic are kept in
+an LRU cache so repeated topics cost one dict lookup. Handlers are called
+in match order until one returns CALLBACK_TAKE_MSG: it owns the message, so
+later handlers are not called. Messages matching no pattern go to fallback.
+"""
+class TopicRouter:
+    class Node:
+        __slots__ = ('children', 'prefixes', 'rest', 'entries')
+
+        def __init__(self):
+            self.children = {}
+            self.prefixes = {}
+            self.rest = []
+            self.entries = []
+
+    def __init__(self, fallback=_defaultMsgCallback, cacheSize=4096):
+        self.fallback = fallback
+        self.cacheSize = cacheSize
+        self._root = self.Node()
+        self._patterns = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._patterns
+
+    def _entriesFor(self, pattern, create):
+        node = self._root
+        levels = pattern.split('/')
+        for idx, level in enumerate(levels):
+            if level == '>' and idx == len(levels) - 1:
+                return node.rest
+            if level[-1:] == '*':
+                nodes, key = node.prefixes, level[:-1]
+            else:
+                nodes, key = node.children, level
+            child = nodes.get(key)
+            if child is None:
+                if not create:
+                    return None
+                child = nodes[key] = self.Node()
+            node = child
+        return node.entries
+
+    def add(self, pattern, handler, user=None):
+        with self._lock:
+            self._entriesFor(pattern, True).append((handler, user))
+            self._patterns += 1
+            self._cache.clear()
+
+    def remove(self, pattern, handler, user=None):
+        with self._lock:
+            entries = self._entriesFor(pattern, False)
+            if entries is None or (handler, user) not in entries:
+                return False
+            entries.remove((handler, user))
+            self._patterns -= 1
+            self._cache.clear()
+            return True
+
+    def count(self, pattern):
+        # handlers added for exactly this pattern
+        with self._lock:
+            entries = self._entriesFor(pattern, False)
+            return len(entries) if entries is not None else 0
+
+    def _match(self, node, levels, idx, out):
+        if idx == len(levels):
+            out.extend(node.entries)
+            return
+        out.extend(node.rest)
+
+        level = levels[idx]
+        child = node.children.get(level)
+        if child is not None:
+            self._match(child, levels, idx + 1, out)
+        for prefix, child in node.prefixes.items():
+            if level.startswith(prefix):
+                self._match(child, levels, idx + 1, out)
+
+    def match(self, topic):
+        key = _toBytes(topic)
+        with self._lock:
+            handlers = self._cache.get(key)
+            if handlers is not None:
+                self._cache.move_to_end(key)
+                return handlers
+
+            out = []
+            self._match(self._root, key.decode().split('/'), 0, out)
+            # same handler through several patterns is called once
+            handlers = tuple(OrderedDict.fromkeys(out))
+
+            self._cache[key] = handlers
+            if len(self._cache) > self.cacheSize:
+                self._cache.popitem(last=False)
+            return handlers
+
+    def callback(self, session_p, msg_p, user_p):
+        if not self._patterns:
+            return self.fallback(session_p, msg_p, user_p)
+
+        d = Destination()
+        if Message._getDest(msg_p, byref(d), sizeof(d)) is None:
+            return self.fallback(session_p, msg_p, user_p)
+
+        handlers = self.match(d.dest)
+        if not handlers:
+            return self.fallback(session_p, msg_p, user_p)
+
+        for handler, user in handlers:
+            if handler(session_p, msg_p, user) == CALLBACK_TAKE_MSG:
+                return CALLBACK_TAKE_MSG
+        return CALLBACK_OK
+
+"""
+ShardedDispatcher processes received messages on a pool of worker threads
+while keeping per-key order: each message is taken (CALLBACK_TAKE_MSG) and
+queued to the shard picked by hashing its key, and each shard has a single
+worker. key is 'dest' (destination name), 'corrId' (correlation id) or a
+function of the Message. Install callback() with setMsgCallback().
+"""
+class ShardedDispatcher:
+    KEY_DEST = 'dest'
+    KEY_CORR_ID = 'corrId'
+
+    class Shard:
+        def __init__(self):
+            self.queue = queue.SimpleQueue()
+            self.processed = 0
+            self.errors = 0
+            self.busy = 0.0
+
+    def __init__(self, handler, shards=4, key=KEY_DEST, name='solclient-shard'):
+        self._clock = time.perf_counter
+
+        self.handler = handler
+        if key == self.KEY_DEST:
+            self._key = lambda msg: msg.getDest().dest
+        elif key == self.KEY_CORR_ID:
+            self._key = lambda msg: msg.getCorrId()
+        else:
+            self._key = key
+
+        self.shards = [ self.Shard() for _ in range(shards) ]
+        self._started = self._clock()
+        self._threads = []
+        for idx, shard in enumerate(self.shards):
+            t = threading.Thread(target=self._work, args=(shard,), name='{}-{}'.format(name, idx), daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def callback(self, opaque_p, msg_p, user_p):
+        msg = Message(msg_p)
+        try:
+            key = self._key(msg)
+        except Exception as e:
+            LOG.log( LOG.ERROR, 'ShardedDispatcher key - {}'.format(e) )
+            key = None
+        self.shards[hash(key) % len(self.shards)].queue.put(msg)
+        return CALLBACK_TAKE_MSG
+
+    def _work(self, shard):
+        clock = self._clock
+        handler = self.handler
+        while True:
+            msg = shard.queue.get()
+            if msg is None:
+                return
+            start = clock()
+            try:
+                handler(msg)
+            except Exception as e:
+                shard.errors += 1
+                LOG.log( LOG.ERROR, 'ShardedDispatcher handler - {}'.format(e) )
+            shard.busy += clock() - start
+            shard.processed += 1
+            del msg
+
+    def stats(self):
+        elapsed = self._clock() - self._started
+        return [ { 'depth': shard.queue.qsize(), 'processed': shard.processed,
+                    'errors': shard.errors,
+                    'utilisation': shard.busy / elapsed if elapsed > 0 else 0.0 }
+                for shard in self.shards ]
+
+    def shutdown(self, wait=True):
+        # queued messages are processed first
+        for shard in self.shards:
+            shard.queue.put(None)
+        if wait:
+            for t in self._threads:
+                t.join()
+
+"""
+ReceiveBuffer decouples reception from processing. Its message callback takes
+each message (CALLBACK_TAKE_MSG) and stores the pointer in a preallocated
+ring; consumers iterate messages() or drain() on their own threads.
+When full, messages are dropped and counted. onHigh(buf) is called when the
+fill level reaches highWatermark (3/4 of capacity), onLow(buf) when it falls
+back to lowWatermark (1/2), e.g. to stop() and start() a Flow while there is
+still room for the messages in flight.
+
+A dropped guaranteed message must not be acknowledged, so a Flow only takes
+a ReceiveBuffer in client ack mode; its dropped messages stay unacked and
+are redelivered once the flow is rebound.
+"""
+class ReceiveBuffer:
+    def __init__(self, capacity=4096, highWatermark=None, lowWatermark=None, onHigh=None, onLow=None):
+        self.capacity = capacity
+        self.highWatermark = capacity * 3 // 4 if highWatermark is None else highWatermark
+        self.lowWatermark = capacity // 2 if lowWatermark is None else lowWatermark
+        self.onHigh = onHigh
+        self.onLow = onLow
+        self.received = 0
+        self.dropped = 0
+
+        self._ring = (c_void_p * capacity)()
+        self._head = 0
+        self._count = 0
+        self._high = False
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def __len__(self):
+        return self._count
+
+    def callback(self, opaque_p, msg_p, user_p):
+        with self._cond:
+            if self._count == self.capacity or self._closed:
+                self.dropped += 1
+                return CALLBACK_OK
+            self._ring[(self._head + self._count) % self.capacity] = msg_p
+            self._count += 1
+            self.received += 1
+            self._cond.notify()
+
+            high = not self._high and self._count >= self.highWatermark
+            if high:
+                self._high = True
+
+        if high and self.onHigh is not None:
+            self.onHigh(self)
+        return CALLBACK_TAKE_MSG
+
+    def _pop(self, n):
+        # with self._cond held, returns (pointers, crossed low watermark)
+        n = min(n, self._count)
+        ptrs = []
+        for _ in range(n):
+            ptrs.append(self._ring[self._head])
+            self._ring[self._head] = None
+            self._head = (self._head + 1) % self.capacity
+        self._count -= n
+
+        low = self._high and self._count <= self.lowWatermark
+        if low:
+            self._high = False
+        return ptrs, low
+
+    def _wrap(self, ptrs, low):
+        if low and self.onLow is not None:
+            self.onLow(self)
+        return [ Message(p) for p in ptrs ]
+
+    def get(self, timeout=None):
+        # next message, or None on timeout or close
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._count or self._closed, timeout) or not self._count:
+                return None
+            ptrs, low = self._pop(1)
+        return self._wrap(ptrs, low)[0]
+
+    def messages(self, timeout=None):
+        while True:
+            msg = self.get(timeout)
+            if msg is None:
+                return
+            yield msg
+
+    def drain(self, max_n=None):
+        # up to max_n buffered messages, without blocking
+        with self._cond:
+            ptrs, low = self._pop(self._count if max_n is None else max_n)
+        return self._wrap(ptrs, low)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            ptrs, _ = self._pop(self._count)
+            self._cond.notify_all()
+        # taken messages are freed with their wrappers
+        self._wrap(ptrs, False)
+
+    def __del__(self):
+        # frees what is still buffered
+        if '_cond' in self.__dict__:
+            self.close()
+
+"""
+BatchDelivery calls callback(msgs) with lists of received messages instead
+of once per message. The message callback only takes the message and appends
+its pointer; batches are delivered by a flush thread once max_batch messages
+are pending or max_delay_us after the first, so callback never runs on the
+context thread. Batches hold at most max_batch messages and are delivered in
+order and never concurrently; flush() and close() deliver from the caller.
+"""
+class BatchDelivery:
+    def __init__(self, callback, max_batch=64, max_delay_us=1000):
+        self._callback = callback
+        self.max_batch = max_batch
+        self.max_delay_us = max_delay_us
+        self.received = 0
+        self.batches = 0
+        self.errors = 0
+
+        self._ptrs = []
+        self._deadline = None
+        self._closed = False
+        self._cond = threading.Condition()
+        self._deliverLock = threading.RLock()
+        self._thread = threading.Thread(target=self._flusher, name='BatchDelivery', daemon=True)
+        self._thread.start()
+
+    def __len__(self):
+        return len(self._ptrs)
+
+    def callback(self, opaque_p, msg_p, user_p):
+        with self._cond:
+            if self._closed:
+                return CALLBACK_OK
+            ptrs = self._ptrs
+            ptrs.append(msg_p)
+            if len(ptrs) == 1:
+                self._deadline = time.monotonic() + self.max_delay_us / 1e6
+                self._cond.notify()
+            elif len(ptrs) == self.max_batch:
+                self._cond.notify()
+        return CALLBACK_TAKE_MSG
+
+    def _flusher(self):
+        while True:
+            with self._cond:
+                if self._closed:
+                    return
+                if not self._ptrs:
+                    self._cond.wait()
+                    continue
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0 and len(self._ptrs) < self.max_batch:
+                    self._cond.wait(remaining)
+                    continue
+            self._deliver()
+
+    def _deliver(self):
+        # _cond is only held for the swap, _deliverLock keeps batches in order
+        with self._deliverLock:
+            with self._cond:
+                ptrs, self._ptrs = self._ptrs, []
+            for start in range(0, len(ptrs), self.max_batch):
+                batch = ptrs[start:start + self.max_batch]
+                self.received += len(batch)
+                self.batches += 1
+                try:
+                    self._callback([ Message(p) for p in batch ])
+                except Exception as e:
+                    self.errors += 1
+                    LOG.log( LOG.ERROR, 'BatchDelivery callback - {}'.format(e) )
+
+    def flush(self):
+        self._deliver()
+
+    def close(self):
+        # stops the flush thread and delivers what is pending
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        self._deliver()
+
+"""
+HeaderExtractor reads the headers of a batch of messages (Message objects or
+message pointers) into a NumPy structured array, one row per message. The
+native getters write straight into the array, so no Python objects are made
+per field. Missing fields read as 0. The returned array is scratch space,
+overwritten by the next extract() unless out is given. Requires numpy.
+"""
+class HeaderExtractor:
+    FIELDS = [ ('msgId', 'u8'), ('seqNum', 'i8'), ('ttl', 'i8'), ('cos', 'u4'),
+            ('redelivered', '?'), ('discard', '?'), ('senderTimestamp', 'i8'),
+            ('rcvTimestamp', 'i8'), ('attachmentLen', 'u4') ]
+
+    # unchecked, writing through plain addresses
+    _getMsgId = _lib['solClient_msg_getMsgId']
+    _getSeqNum = _lib['solClient_msg_getSequenceNumber']
+    _getTTL = _lib['solClient_msg_getTimeToLive']
+    _getCOS = _lib['solClient_msg_getClassOfService']
+    _getSenderTimestamp = _lib['solClient_msg_getSenderTimestamp']
+    _getRcvTimestamp = _lib['solClient_msg_getRcvTimestamp']
+    for _f in (_getMsgId, _getSeqNum, _getTTL, _getCOS, _getSenderTimestamp, _getRcvTimestamp):
+        _f.argtypes = [c_void_p, c_void_p]
+        _f.restype  = c_int
+
+    _getBinaryAttachment = _lib['solClient_msg_getBinaryAttachmentPtr']
+    _getBinaryAttachment.argtypes = [c_void_p, c_void_p, c_void_p]
+    _getBinaryAttachment.restype  = c_int
+
+    _isRedelivered = _lib['solClient_msg_isRedelivered']
+    _isDiscardIndicated = _lib['solClient_msg_isDiscardIndication']
+    for _f in (_isRedelivered, _isDiscardIndicated):
+        _f.argtypes = [c_void_p]
+        _f.restype  = c_ubyte
+    del _f
+
+    def __init__(self, capacity=10000):
+        import numpy
+        self._numpy = numpy
+        # aligned, so the 8 byte fields are written at aligned addresses
+        self.dtype = numpy.dtype(self.FIELDS, align=True)
+        self._scratch = numpy.zeros(capacity, self.dtype)
+        self._attachment_p = c_void_p()
+
+    def extract(self, msgs, out=None):
+        n = len(msgs)
+        if out is None:
+            if len(self._scratch) < n:
+                self._scratch = self._numpy.zeros(n, self.dtype)
+            out = self._scratch
+        elif out.dtype != self.dtype or len(out) < n:
+            raise ValueError('out must hold {} rows of {}'.format(n, self.dtype))
+        elif not (out.flags.c_contiguous and out.flags.writeable):
+            # rows are written at out.ctypes.data + idx * itemsize
+            raise ValueError('out must be C contiguous and writeable')
+        out = out[:n]
+        out.fill(0)
+        if not n:
+            return out
+
+        fields = self.dtype.fields
+        stride = self.dtype.itemsize
+        (oMsgId, oSeqNum, oTTL, oCOS, oRedelivered, oDiscard, oSenderTs, oRcvTs, oLen) = [
+                fields[name][1] for name, _ in self.FIELDS ]
+        base = out.ctypes.data
+        raw = (c_ubyte * (n * stride)).from_address(base)
+        attachment_p = byref(self._attachment_p)
+
+        getMsgId, getSeqNum, getTTL, getCOS = self._getMsgId, self._getSeqNum, self._getTTL, self._getCOS
+        getSenderTs, getRcvTs, getAttachment = self._getSenderTimestamp, self._getRcvTimestamp, self._getBinaryAttachment
+        isRedelivered, isDiscard = self._isRedelivered, self._isDiscardIndicated
+
+        for idx, msg in enumerate(msgs):
+            if isinstance(msg, Message):
+                msg = msg._pt
+            row = idx * stride
+            addr = base + row
+            # getters only fail with FAIL, NOT_FOUND leaves the 0
+            if min(getMsgId(msg, addr + oMsgId), getSeqNum(msg, addr + oSeqNum),
+                    getTTL(msg, addr + oTTL), getCOS(msg, addr + oCOS),
+                    getSenderTs(msg, addr + oSenderTs), getRcvTs(msg, addr + oRcvTs),
+                    getAttachment(msg, attachment_p, addr + oLen)) < ReturnCode.OK:
+                raise SolaceError(ReturnCode.FAIL, 'HeaderExtractor.extract row {}'.format(idx))
+            raw[row + oRedelivered] = isRedelivered(msg)
+            raw[row + oDiscard] = isDiscard(msg)
+        return out
+
+#############
+# Stats
+#############
+
+class Stats:
+    # ENUM solClient_stats_rx_t, also for flows
+    RX = ( 'DIRECT_BYTES', 'DIRECT_MSGS', 'READS', 'DISCARD_IND', 'DISCARD_SMF_UNKNOWN_ELEMENT',
+        'CACHEREQUEST_SENT', 'CACHEREQUEST_OK_RESPONSE', 'CACHEREQUEST_FAIL_RESPONSE',
+        'CACHEREQUEST_FULFILL_DISCARD_RESPONSE', 'CACHED_REPLY_MSGS', 'CACHED_REPLY_BYTES',
+        'CACHEREQUEST_INCOMPLETE_RESPONSE', 'ACKED', 'DISCARD_DUPLICATE', 'DISCARD_NO_MATCHING_FLOW',
+        'DISCARD_OUTOFORDER', 'PERSISTENT_BYTES', 'PERSISTENT_MSGS', 'NONPERSISTENT_BYTES',
+        'NONPERSISTENT_MSGS', 'CTL_MSGS', 'CTL_BYTES', 'TOTAL_DATA_BYTES', 'TOTAL_DATA_MSGS',
+        'COMPRESSED_BYTES', 'REPLY_MSG', 'REPLY_MSG_DISCARD' )
+
+    # ENUM solClient_stats_tx_t
+    TX = ( 'TOTAL_DATA_BYTES', 'TOTAL_DATA_MSGS', 'DIRECT_BYTES', 'DIRECT_MSGS',
+        'PERSISTENT_BYTES', 'PERSISTENT_MSGS', 'NONPERSISTENT_BYTES', 'NONPERSISTENT_MSGS',
+        'PERSISTENT_BYTES_REDELIVERED', 'PERSISTENT_REDELIVERED', 'NONPERSISTENT_BYTES_REDELIVERED',
+        'NONPERSISTENT_REDELIVERED', 'ACKS_RXED', 'WINDOW_CLOSE', 'ACK_TIMEOUT', 'CTL_MSGS',
+        'CTL_BYTES', 'COMPRESSED_BYTES', 'TOTAL_CONNECTION_ATTEMPTS', 'REQUEST_SENT',
+        'REQUEST_TIMEOUT', 'CACHEREQUEST_SENT', 'GUARANTEED_MSGS_SENT_CONFIRMED',
+        'DISCARD_NO_MATCH', 'DISCARD_CHANNEL_ERROR', 'BLOCKED_ON_SEND' )
+
+    @staticmethod
+    def read(getStats, pt, prefix, names, counters):
+        arr = (c_uint64 * len(names))()
+        getStats(pt, arr, len(arr))
+        counters.update(zip([ prefix + n for n in names ], arr))
+        return counters
+
+"""
+StatsSnapshot holds native counters read at one time, by name, e.g.
+RX_DISCARD_IND or TX_WINDOW_CLOSE. later - earlier gives the deltas over
+interval seconds; a counter that went backwards was cleared in between and
+counts from 0.
+"""
+class StatsSnapshot:
+    def __init__(self, counters, timestamp=None, interval=None):
+        self.counters = counters
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.interval = interval
+
+    def __getitem__(self, name):
+        return self.counters[name]
+
+    def __iter__(self):
+        return iter(self.counters)
+
+    def __len__(self):
+        return len(self.counters)
+
+    def items(self):
+        return self.counters.items()
+
+    def __sub__(self, other):
+        before = other.counters
+        return StatsSnapshot({ name: value - before.get(name, 0) if value >= before.get(name, 0) else value
+                for name, value in self.counters.items() }, self.timestamp, self.timestamp - other.timestamp)
+
+    def rates(self):
+        # per second, for a delta
+        if not self.interval:
+            raise ValueError('rates() needs a delta of two snapshots')
+        return { name: value / self.interval for name, value in self.counters.items() }
+
+    def __repr__(self):
+        nonzero = ', '.join('{}={}'.format(k, v) for k, v in self.counters.items() if v)
+        return 'StatsSnapshot({})'.format(nonzero)
+
+"""
+StatsExporter renders the stats() of Sessions and Flows, given as
+{name: source}, in the Prometheus text format. start() rewrites path every
+interval seconds, atomically for textfile collectors; httpHandler() returns
+an http.server request handler serving the same text.
+"""
+class StatsExporter:
+    def __init__(self, sources, path=None, interval=10.0, prefix='solclient'):
+        self.sources = sources
+        self.path = path
+        self.interval = interval
+        self.prefix = prefix
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _label(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    def render(self):
+        snapshots = []
+        for name, source in list(self.sources.items()):
+            try:
+                snapshots.append((self._label(name), source.stats()))
+            except SolaceError as e:
+                LOG.log( LOG.ERROR, 'StatsExporter {} - {}'.format(name, e) )
+                _lib.solClient_resetLastErrorInfo()
+
+        counters = OrderedDict()
+        for name, snap in snapshots:
+            for counter, value in snap.items():
+                counters.setdefault(counter, []).append((name, value))
+
+        lines = []
+        for counter, values in counters.items():
+            metric = '{}_{}_total'.format(self.prefix, counter.lower())
+            lines.append('# TYPE {} counter'.format(metric))
+            lines.extend('{}{{source="{}"}} {}'.format(metric, name, value) for name, value in values)
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path=None):
+        path = self.path if path is None else path
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+    def start(self):
+        if self.path is None:
+            raise ValueError('StatsExporter.start() needs a path')
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='StatsExporter', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                self.write()
+            except OSError as e:
+                LOG.log( LOG.ERROR, 'StatsExporter {} - {}'.format(self.path, e) )
+            if self._stop.wait(self.interval):
+                return
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def httpHandler(self):
+        from http.server import BaseHTTPRequestHandler
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = exporter.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+###############
+# SessionInfo
+###############
+
+class SessionFuncInfo(Structure):
+    class _Rx_Info(Structure):
+        _fields_ = [ ('callback_p', c_void_p), ('user_p', c_void_p) ]
+
+    class _Msg_Callback(Structure):
+        _fields_ = [ ('callback_p', MSG_CALLBACK_TYPE), ('user_p', c_void_p) ]
+    
+    class _Event_Callback(Structure):
+        _fields_ = [ ('callback_p', EVENT_CALLBACK_TYPE), ('user_p', c_void_p) ]
+
+    _fields_ = [ \
+                ('rxInfo', _Rx_Info),
+                ('eventInfo', _Event_Callback),
+                ('rxMsgInfo', _Msg_Callback) ]
+
+    def setMsgCallback(self, cb, user_p=None):
+        self.rxMsgInfo.callback_p = MSG_CALLBACK_TYPE(_instrumentation.callback('Session.msg', cb))
+        self.rxMsgInfo.user_p = cast(user_p, c_void_p)
+
+    # set by Session, a weakref to it
+    _session = None
+
+    def setEventCallback(self, cb, user_p=None):
+        # confirmations for Session.subscribeMany() and friends go to
+        # Session.subscriptionEvent(), everything else to cb
+        def onEvent(session_p, eventInfo_p, user_p):
+            session = self._session() if self._session is not None else None
+            if session is None or not session.subscriptionEvent(eventInfo_p):
+                cb(session_p, eventInfo_p, user_p)
+
+        self.eventInfo.callback_p = EVENT_CALLBACK_TYPE(_instrumentation.callback('Session.event', onEvent))
+        self.eventInfo.user_p = cast(user_p, c_void_p)
+
+    def setReceiveBuffer(self, buf):
+        self.rxBuffer = buf
+        self.setMsgCallback(buf.callback)
+
+    def setBatchDelivery(self, batch):
+        self.batchDelivery = batch
+        self.setMsgCallback(batch.callback)
+
+    def setLatencyTracker(self, tracker):
+        self.latencyTracker = tracker
+        self.setMsgCallback(tracker.callback)
+
+    def setRouter(self, router):
+        self.router = router
+        self.setMsgCallback(router.callback)
+
+
+#############
+# Flow
+#############
+"""
+Same as SessionFuncInfo
+"""
+class FlowFuncInfo(Structure):
+    class _Rx_Info(Structure):
+        _fields_ = [ ('callback_p', c_void_p), ('user_p', c_void_p) ]
+
+    class _Msg_Callback(Structure):
+        _fields_ = [ ('callback_p', MSG_CALLBACK_TYPE), ('user_p', c_void_p) ]
+    
+    class _Event_Callback(Structure):
+        _fields_ = [ ('callback_p', EVENT_CALLBACK_TYPE), ('user_p', c_void_p) ]
+
+    _fields_ = [ \
+                ('rxInfo', _Rx_Info),
+                ('eventInfo', _Event_Callback),
+                ('rxMsgInfo', _Msg_Callback) ]
+
+    def setMsgCallback(self, cb, user_p=None):
+        self.rxMsgInfo.callback_p = MSG_CALLBACK_TYPE(_instrumentation.callback('Flow.msg', cb))
+        self.rxMsgInfo.user_p = cast(user_p, c_void_p)
+
+    def setEventCallback(self, cb, user_p=None):
+        self.eventInfo.callback_p = EVENT_CALLBACK_TYPE(_instrumentation.callback('Flow.event', cb))
+        self.eventInfo.user_p = cast(user_p, c_void_p)
+
+    def setReceiveBuffer(self, buf):
+        self.rxBuffer = buf
+        self.setMsgCallback(buf.callback)
+
+    def setBatchDelivery(self, batch):
+        self.batchDelivery = batch
+        self.setMsgCallback(batch.callback)
+
+    def setLatencyTracker(self, tracker):
+        self.latencyTracker = tracker
+        self.setMsgCallback(tracker.callback)
+
+class Flow:
+    _create = _lib.solClient_session_createFlow
+    _create.argtypes = [POINTER(c_char_p), c_void_p, c_void_p, POINTER(FlowFuncInfo), c_size_t]
+    _create.restype  = c_int
+    _create.errcheck = ReturnCode.raiseExcept((ReturnCode.OK, ReturnCode.IN_PROGRESS))
+    def __init__(self, session, fprops, funcInfo = None):
+        if funcInfo is None:
+            funcInfo = FlowFuncInfo()
+            funcInfo.setMsgCallback(_defaultMsgCallback)
+            funcInfo.setEventCallback(_defaultEventCallback)
+        self._pt = c_void_p()
+        self._checkAckMode(fprops, funcInfo)
+        self.session = session
+        self.fprops = fprops
+        self.funcInfo = funcInfo
+        self._create(fprops.toCPropsArray(), session._pt, byref(self._pt), pointer(funcInfo), sizeof(funcInfo))
+
+    @staticmethod
+    def _checkAckMode(fprops, funcInfo):
+        # auto ack would acknowledge what a full ReceiveBuffer drops
+        if getattr(funcInfo, 'rxBuffer', None) is not None and \
+            fprops._props().get('ACKMODE', FlowProperties.ACKMODE_AUTO) != FlowProperties.ACKMODE_CLIENT:
+                raise ValueError('a Flow with a ReceiveBuffer needs ACKMODE=ACKMODE_CLIENT')
+
+    _start = _lib.solClient_flow_start
+    _start.argtypes = [c_void_p]
+    _start.restype  = c_int
+    _start.errcheck = ReturnCode.raiseNotOK
+    def start(self):
+        return self._start(self._pt)
+    
+    _stop = _lib.solClient_flow_stop
+    _stop.argtypes = [c_void_p]
+    _stop.restype  = c_int
+    _stop.errcheck = ReturnCode.raiseNotOK
+    def stop(self):
+        return self._stop(self._pt)
+
+    _ack = _lib.solClient_flow_sendAck
+    _ack.argtypes = [c_void_p, c_uint64]
+    _ack.restype  = c_int
+    _ack.errcheck = ReturnCode.raiseNotOK
+    def ack(self, msgId):
+        self._ack(self._pt, msgId)
+
+    @classmethod
+    def ackPtr(cls, flow_p, msg_p):
+        cls._ack(flow_p, Message.getMsgPtrId(msg_p))
+
+    # with funcInfo.setReceiveBuffer()
+    def messages(self, timeout=None):
+        return self.funcInfo.rxBuffer.messages(timeout)
+
+    def drain(self, max_n=None):
+        return self.funcInfo.rxBuffer.drain(max_n)
+
+    _getRxStats = _lib.solClient_flow_getRxStats
+    _getRxStats.argtypes = [c_void_p, POINTER(c_uint64), c_uint32]
+    _getRxStats.restype  = c_int
+    _getRxStats.errcheck = ReturnCode.raiseNotOK
+    def stats(self):
+        return StatsSnapshot(Stats.read(self._getRxStats, self._pt, 'RX_', Stats.RX, {}))
+
+    _clearStats = _lib.solClient_flow_clearStats
+    _clearStats.argtypes = [c_void_p]
+    _clearStats.restype  = c_int
+    _clearStats.errcheck = ReturnCode.raiseNotOK
+    def clearStats(self):
+        return self._clearStats(self._pt)
+
+    _destroy = _lib.solClient_flow_destroy
+    _destroy.argtypes = [c_void_p]
+    _destroy.restype  = c_int
+    _destroy.errcheck = ReturnCode.raiseNotOK
+    def __del__(self):
+        if not self._pt:
+            # rejected before creation
+            return
+        try:
+            self._destroy(byref(self._pt))
+        except SolaceError as e:
+            LOG.log( LOG.ERROR, str(e) )
+            _lib.solClient_resetLastErrorInfo()
+
+#############
+# Session
+#############
+
+class Session:
+    PEER_PLATFORM = "SESSION_PEER_PLATFORM"
+    PEER_PORT_SPEED = "SESSION_PEER_PORT_SPEED"
+    PEER_PORT_TYPE = "SESSION_PEER_PORT_TYPE"
+    PEER_ROUTER_NAME = "SESSION_PEER_ROUTER_NAME"
+    PEER_SOFTWARE_DATE = "SESSION_PEER_SOFTWARE_DATE"
+    PEER_SOFTWARE_VERSION = "SESSION_PEER_SOFTWARE_VERSION"
+
+    _create = _lib.solClient_session_create
+    _create.argtypes = [POINTER(c_char_p), c_void_p, c_void_p, POINTER(SessionFuncInfo), c_size_t]
+    _create.restype  = c_int
+    _create.errcheck = ReturnCode.raiseNotOK
+    def __init__(self, context, props, funcInfo = None):
+        if funcInfo is None:
+            funcInfo = SessionFuncInfo()
+            funcInfo.setRouter(TopicRouter())
+            funcInfo.setEventCallback(_defaultEventCallback)
+
+        self._pt = c_void_p()
+        self.context = context
+        self.funcInfo = funcInfo
+        funcInfo._session = weakref.ref(self)
+        self.subscriptions = set()
+        self._corrIds = itertools.count(1)
+        self._subPending = {}
+
+        self._create(props.toCPropsArray(), context._pt, byref(self._pt),
+                pointer(self.funcInfo), sizeof(funcInfo))
+
+    _connect = _lib.solClient_session_connect
+    _connect.argtypes = [c_void_p]
+    _connect.restype  = c_int
+    _connect.errcheck = ReturnCode.raiseExcept((ReturnCode.OK, ReturnCode.IN_PROGRESS))
+    def connect(self):
+        return self._connect(self._pt)
+
+    # with funcInfo.setReceiveBuffer()
+    def messages(self, timeout=None):
+        return self.funcInfo.rxBuffer.messages(timeout)
+
+    def drain(self, max_n=None):
+        return self.funcInfo.rxBuffer.drain(max_n)
+
+    _getRxStats = _lib.solClient_session_getRxStats
+    _getRxStats.argtypes = [c_void_p, POINTER(c_uint64), c_uint32]
+    _getRxStats.restype  = c_int
+    _getRxStats.errcheck = ReturnCode.raiseNotOK
+    _getTxStats = _lib.solClient_session_getTxStats
+    _getTxStats.argtypes = [c_void_p, POINTER(c_uint64), c_uint32]
+    _getTxStats.restype  = c_int
+    _getTxStats.errcheck = ReturnCode.raiseNotOK
+    def stats(self):
+        counters = Stats.read(self._getRxStats, self._pt, 'RX_', Stats.RX, {})
+        return StatsSnapshot(Stats.read(self._getTxStats, self._pt, 'TX_', Stats.TX, counters))
+
+    _clearStats = _lib.solClient_session_clearStats
+    _clearStats.argtypes = [c_void_p]
+    _clearStats.restype  = c_int
+    _clearStats.errcheck = ReturnCode.raiseNotOK
+    def clearStats(self):
+        return self._clearStats(self._pt)
+
+    _createTempTopic = _lib.solClient_session_createTemporaryTopicName
+    _createTempTopic.argtypes = [c_void_p, c_char_p, c_size_t]
+    _createTempTopic.restype  = c_int
+    _createTempTopic.errcheck = ReturnCode.returnString
+    def createTempTopic(self):
+        return self._createTempTopic(self._pt, create_string_buffer(BufInfo.MAX_TOPIC_SIZE), BufInfo.MAX_TOPIC_SIZE)
+
+    _disconnect = _lib.solClient_session_disconnect
+    _disconnect.argtypes = [c_void_p]
+    _disconnect.restype  = c_int
+    _disconnect.errcheck = ReturnCode.raiseNotOK
+    def disconnect(self):
+        return self._disconnect(self._pt)
+
+    _sendMsg = _lib.solClient_session_sendMsg
+    _sendMsg.argtypes = [c_void_p, c_void_p]
+    _sendMsg.restype  = c_int
+    _sendMsg.errcheck = ReturnCode.raiseExcept((ReturnCode.OK, ReturnCode.WOULD_BLOCK))
+    def sendMsg(self, msg):
+        return self._sendMsg(self._pt, msg._pt)
+
+    _sendMultipleMsg = _lib.solClient_session_sendMultipleMsg
+    _sendMultipleMsg.argtypes = [c_void_p, POINTER(c_void_p), c_uint32, POINTER(c_uint32)]
+    _sendMultipleMsg.restype  = c_int
+    _sendMultipleMsg.errcheck = ReturnCode.raiseExcept((ReturnCode.OK, ReturnCode.WOULD_BLOCK))
+    def sendMultiple(self, msgs):
+        # sends up to SOLCLIENT_SESSION_SEND_MULTIPLE_LIMIT messages per native call.
+        # returns (rc, unsent); on WOULD_BLOCK, unsent holds the messages not written, in order.
+        msgs = list(msgs)
+        limit = SOLCLIENT_SESSION_SEND_MULTIPLE_LIMIT
+        msgArray = (c_void_p * limit)()
+        written = c_uint32()
+
+        for start in range(0, len(msgs), limit):
+            chunk = msgs[start:start + limit]
+            for idx, msg in enumerate(chunk):
+                msgArray[idx] = msg._pt.value
+
+            rc = self._sendMultipleMsg(self._pt, msgArray, len(chunk), byref(written))
+            if rc != ReturnCode.OK or written.value < len(chunk):
+                return rc, msgs[start + written.value:]
+
+        return ReturnCode.OK, []
+
+    _topicSub = _lib.solClient_session_topicSubscribe
+    _topicSub.argtypes = [c_void_p, c_char_p]
+    _topicSub.restype  = c_int
+    _topicSub.errcheck = ReturnCode.raiseExcept((ReturnCode.OK, ReturnCode.WOULD_BLOCK, ReturnCode.IN_PROGRESS))
+    _topicSubExt = _lib.solClient_session_topicSubscribeExt
+    _topicSubExt.argtypes = [c_void_p, c_uint32, c_char_p]
+    _topicSubExt.restype  = c_int
+    _topicSubExt.errcheck = ReturnCode.raiseExcept((ReturnCode.OK, ReturnCode.WOULD_BLOCK, ReturnCode.IN_PROGRESS))
+    def topicSubscribe(self, topic, flags = None):
+        if flags is not None:
+            rc = self._topicSubExt(self._pt, flags, _topicBytes(topic))
+        else:
+            rc = self._topicSub(self._pt, _topicBytes(topic))
+        # WOULD_BLOCK means nothing was sent
+        if rc != ReturnCode.WOULD_BLOCK:
+            self.subscriptions.add(_topicName(topic))
+        return rc
+
+    _topicSubDispatch = _lib.solClient_session_topicSubscribeWithDispatch
+    _topicSubDispatch.argtypes = [c_void_p, c_uint32, c_char_p, c_void_p, c_void_p]
+    _topicSubDispatch.restype  = c_int
+    _topicSubDispatch.errcheck = ReturnCode.raiseExcept((ReturnCode.OK, ReturnCode.WOULD_BLOCK, ReturnCode.IN_PROGRESS))
+    # dispatchFunc(session_p, msg_p, user) is called for messages matching
+    # topic, routed by the session TopicRouter, see SessionFuncInfo.setRouter()
+    def topicSubscribeDispatch(self, topic, flags, dispatchFunc, user):
+        topic = _topicName(topic)
+        self._router().add(topic, dispatchFunc, user)
+        try:
+            return self.topicSubscribe(topic, flags)
+        except:
+            self._router().remove(topic, dispatchFunc, user)
+            raise
+
+    def topicUnsubscribeDispatch(self, topic, flags, dispatchFunc, user):
+        topic = _topicName(topic)
+        router = self._router()
+        router.remove(topic, dispatchFunc, user)
+        # other handlers on the same pattern still need the subscription
+        if router.count(topic):
+            return ReturnCode.OK
+        errors = self.unsubscribeMany([ topic ], flags or 0)
+        if errors:
+            raise errors[topic]
+        return ReturnCode.OK
+
+    def _router(self):
+        router = getattr(self.funcInfo, 'router', None)
+        if router is None:
+            raise ValueError('Session has no TopicRouter, see SessionFuncInfo.setRouter()')
+        return router
+
+    _topicUnsubDispatch = _lib.solClient_session_topicUnsubscribeWithDispatch
+    _topicUnsubDispatch.argtypes = [c_void_p, c_uint32, c_char_p, c_void_p, c_void_p]
+    _topicUnsubDispatch.restype  = c_int
+    _topicUnsubDispatch.errcheck = ReturnCode.raiseExcept((ReturnCode.OK, ReturnCode.WOULD_BLOCK, ReturnCode.IN_PROGRESS))
+
+    # subscribeMany(), unsubscribeMany() and setSubscriptions() pipeline the
+    # requests: all but the last ask for a confirmation event, only the last
+    # waits for confirmation. Failures are returned as {topic: error}, and
+    # subscriptions holds topic strings, whether given as str, bytes or
+    # Destination. SessionFuncInfo routes the confirmation events to
+    # subscriptionEvent() ahead of the event callback.
+    def subscribeMany(self, topics, flags=0, timeout=10.0):
+        topics = [ _topicName(t) for t in topics ]
+        errors = self._pipeline(self._topicSubDispatch, topics, flags, timeout)
+        self.subscriptions.update(t for t in topics if t not in errors)
+        return errors
+
+    def unsubscribeMany(self, topics, flags=0, timeout=10.0):
+        topics = [ _topicName(t) for t in topics ]
+        errors = self._pipeline(self._topicUnsubDispatch, topics, flags, timeout)
+        self.subscriptions.difference_update(t for t in topics if t not in errors)
+        return errors
+
+    def setSubscriptions(self, desired, flags=0, timeout=10.0):
+        # only sends the difference to the applied subscriptions
+        desired = set(map(_topicName, desired))
+        errors = self.unsubscribeMany(sorted(self.subscriptions - desired), flags, timeout)
+        errors.update(self.subscribeMany(sorted(desired - self.subscriptions), flags, timeout))
+        return errors
+
+    def _pipeline(self, func, topics, flags, timeout):
+        batch = _SubscriptionBatch()
+
+        for idx, topic in enumerate(topics):
+            topic = _topicName(topic)
+            last = idx == len(topics) - 1
+            corrId = 0
+            if not last:
+                corrId = next(self._corrIds)
+                batch.add(corrId, topic)
+                self._subPending[corrId] = batch
+
+            try:
+                rc = func(self._pt, flags | (SubscribeFlags.WAITFORCONFIRM if last else SubscribeFlags.REQUEST_CONFIRM),
+                        _topicBytes(topic), None, corrId)
+                if rc == ReturnCode.WOULD_BLOCK:
+                    # not sent, so no confirmation will come
+                    raise SolaceError(rc, '{}(), topic={} not sent'.format(func.__name__, topic))
+            except SolaceError as e:
+                self._subPending.pop(corrId, None)
+                batch.settle(corrId, topic, e)
+
+        if not batch.wait(timeout):
+            for corrId, topic in batch.unconfirmed():
+                self._subPending.pop(corrId, None)
+                batch.errors[topic] = TimeoutError('no confirmation for {}'.format(topic))
+        return batch.errors
+
+    def subscriptionEvent(self, eventInfo_p):
+        # True if the event belonged to subscribeMany() and friends
+        info = eventInfo_p.contents
+        if info.sessionEvent != SessionEvent.SUBSCRIPTION_OK and \
+            info.sessionEvent != SessionEvent.SUBSCRIPTION_ERROR:
+                return False
+
+        corrId = info.correlation_p or 0
+        batch = self._subPending.pop(corrId, None)
+        if batch is None:
+            return False
+
+        error = None
+        if info.sessionEvent == SessionEvent.SUBSCRIPTION_ERROR:
+            error = SolaceError(ReturnCode.FAIL, '{} {}'.format(
+                SessionEvent.toString(info.sessionEvent), batch.topic(corrId)))
+        batch.settle(corrId, batch.topic(corrId), error)
+        return True
+
+    _dteUnsub = _lib.solClient_session_dteUnsubscribe
+    _dteUnsub.argtypes = [c_void_p, c_char_p, c_void_p]
+    _dteUnsub.restype  = c_int
+    _dteUnsub.errcheck = ReturnCode.raiseNotOK
+    def dteUnsubscribe(self, dte, corrTag=None):
+        return self._dteUnsub(self._pt, dte.encode(), corrTag)
+
+    _epProvision = _lib.solClient_session_endpointProvision
+    _epProvision.argtypes = [POINTER(c_char_p), c_void_p, c_int, c_void_p, c_char_p, c_size_t]
+    _epProvision.restype  = c_int
+    _epProvision.errcheck = ReturnCode.raiseExcept((ReturnCode.OK, ReturnCode.IN_PROGRESS, ReturnCode.WOULD_BLOCK))
+    def epProvision(self, epprops, flags=ProvisionFlags.WAITFORCONFIRM, corrTag=None):
+        return self._epProvision(epprops.toCPropsArray(), self._pt, flags, corrTag, None, 0)
+
+    _destroy = _lib.solClient_session_destroy
+    _destroy.argtypes = [c_void_p]
+    _destroy.restype  = c_int
+    _destroy.errcheck = ReturnCode.raiseNotOK
+    def __del__(self):
+        if not self.__dict__.get('_pt'):
+            # failed before creation
+            return
+        try:
+            self._destroy(byref(self._pt))
+        except SolaceError as e:
+            LOG.log( LOG.ERROR, str(e) )
+            _lib.solClient_resetLastErrorInfo()
+
+"""
+AsyncSession makes connect(), subscribe() and publish() awaitable. It sets
+the session to non-blocking connect, send and subscribe, and to one
+acknowledgement event per message, and resolves each awaitable from the
+session events. A guaranteed publish resolves on
+ACKNOWLEDGEMENT and raises SolaceError on REJECTED_MSG_ERROR; publish()
+owns the correlation tag of the message it sends.
+
+Use it with an AsyncioContext, or with a threaded Context, in which case
+events are handed to the loop thread; create it within the running loop then.
+"""
+class AsyncSession(Session):
+    def __init__(self, context, props, msgCallback=None):
+        import asyncio
+
+        self.loop = getattr(context, 'loop', None) or asyncio.get_running_loop()
+        props = type(props)(props._props().items())
+        props.CONNECT_BLOCKING = PROP_DISABLE_VAL
+        props.SEND_BLOCKING = PROP_DISABLE_VAL
+        props.SUBSCRIBE_BLOCKING = PROP_DISABLE_VAL
+        # each ACKNOWLEDGEMENT settles the one publish() of its correlation tag
+        props.ACK_EVENT_MODE = SessionProperties.ACK_EVENT_MODE_PER_MSG
+
+        self._connecting = None
+        self._pending = {}
+        self._canSend = asyncio.Event()
+        self._canSend.set()
+
+        # no reference cycle through the native callback
+        ref = weakref.ref(self)
+        def onEvent(session_p, eventInfo_p, user_p):
+            session = ref()
+            if session is not None:
+                session._onEvent(session_p, eventInfo_p, user_p)
+
+        funcInfo = SessionFuncInfo()
+        funcInfo.setMsgCallback(msgCallback or _defaultMsgCallback)
+        funcInfo.setEventCallback(onEvent)
+        super().__init__(context, props, funcInfo)
+
+    def _onEvent(self, session_p, eventInfo_p, user_p):
+        info = eventInfo_p.contents
+        event = info.sessionEvent
+
+        if event == SessionEvent.UP_NOTICE:
+            self._settle(self._connecting)
+
+        elif event == SessionEvent.CONNECT_FAILED_ERROR:
+            self._settle(self._connecting, SolaceError(ReturnCode.FAIL, SessionEvent.toString(event)))
+
+        elif event == SessionEvent.ACKNOWLEDGEMENT or \
+            event == SessionEvent.SUBSCRIPTION_OK:
+                self._settle(self._pending.pop(info.correlation_p or 0, None))
+
+        elif event == SessionEvent.REJECTED_MSG_ERROR or \
+            event == SessionEvent.SUBSCRIPTION_ERROR:
+                self._settle(self._pending.pop(info.correlation_p or 0, None),
+                        SolaceError(ReturnCode.FAIL, SessionEvent.toString(event)))
+
+        elif event == SessionEvent.CAN_SEND:
+            self.loop.call_soon_threadsafe(self._canSend.set)
+
+        elif event == SessionEvent.DOWN_ERROR:
+            error = SolaceError(ReturnCode.FAIL, SessionEvent.toString(event))
+            self._settle(self._connecting, error)
+            pending, self._pending = self._pending, {}
+            for fut in pending.values():
+                self._settle(fut, error)
+
+        if event != SessionEvent.ACKNOWLEDGEMENT:
+            _defaultEventCallback(session_p, eventInfo_p, user_p)
+
+    def _settle(self, fut, error=None):
+        if fut is not None:
+            self.loop.call_soon_threadsafe(self._resolve, fut, error)
+
+    @staticmethod
+    def _resolve(fut, error):
+        if fut.done():
+            return
+        if error is None:
+            fut.set_result(ReturnCode.OK)
+        else:
+            fut.set_exception(error)
+
+    async def _whenCanSend(self, send):
+        while True:
+            rc = send()
+            if rc != ReturnCode.WOULD_BLOCK:
+                return rc
+            self._canSend.clear()
+            await self._canSend.wait()
+
+    def _track(self):
+        corrId = next(self._corrIds)
+        fut = self.loop.create_future()
+        self._pending[corrId] = fut
+        return corrId, fut
+
+    async def connect(self):
+        self._connecting = self.loop.create_future()
+        if super().connect() == ReturnCode.OK:
+            self._connecting = None
+            return ReturnCode.OK
+        return await self._connecting
+
+    async def subscribe(self, topic, flags=0):
+        corrId, fut = self._track()
+        try:
+            await self._whenCanSend(lambda: self._topicSubDispatch(self._pt,
+                flags | SubscribeFlags.REQUEST_CONFIRM, _topicBytes(topic), None, corrId))
+        except:
+            self._pending.pop(corrId, None)
+            raise
+        return await fut
+
+    async def publish(self, msg):
+        if msg.getDelivery() == Message.DELIVERY_MODE_DIRECT:
+            return await self._whenCanSend(lambda: self.sendMsg(msg))
+
+        corrId, fut = self._track()
+        try:
+            msg.setCorrTagPtr(corrId, 0)
+            await self._whenCanSend(lambda: self.sendMsg(msg))
+        except:
+            self._pending.pop(corrId, None)
+            raise
+        return await fut
+
+"""
+ShardedConsumer supervises N worker processes, each with its own Context and
+Session. Topics are split into disjoint subsets, one per worker; with
+queueName every worker also binds a Flow to that queue, which should be
+non-exclusive. handler(msg) runs in the workers, so it must be picklable
+for the 'spawn' start method. Workers report counters over a shared queue,
+read with stats(), and are restarted when they exit unexpectedly: after
+restartBackoff seconds, doubling for each quick successive failure up to
+maxBackoff, and at most maxRestarts times per worker when that is given.
+"""
+class ShardedConsumer:
+    def __init__(self, props, handler, workers=None, topics=(), queueName=None,
+            statsInterval=1.0, restart=True, startMethod='spawn',
+            restartBackoff=0.5, maxBackoff=30.0, maxRestarts=None, target=None):
+        import multiprocessing
+
+        self._mp = multiprocessing.get_context(startMethod)
+        self.props = props._props()
+        self.handler = handler
+        self.workers = workers or os.cpu_count()
+        self.topics = list(topics)
+        self.queueName = queueName
+        self.statsInterval = statsInterval
+        self.restart = restart
+        self.restartBackoff = restartBackoff
+        self.maxBackoff = maxBackoff
+        self.maxRestarts = maxRestarts
+        self.target = target or _shardedConsumerMain
+
+        self.restarts = [0] * self.workers
+        self._failures = [0] * self.workers
+        self._startedAt = [None] * self.workers
+        self._retryAt = [None] * self.workers
+        self._stats = {}
+        self._statsQueue = self._mp.Queue()
+        self._stop = self._mp.Event()
+        self._procs = [None] * self.workers
+        self._supervisor = None
+        self._statsLock = threading.Lock()
+
+    def shardTopics(self, idx):
+        return self.topics[idx::self.workers]
+
+    def start(self):
+        for idx in range(self.workers):
+            self._spawn(idx)
+        self._supervisor = threading.Thread(target=self._supervise, name='solclient-supervisor', daemon=True)
+        self._supervisor.start()
+
+    def _spawn(self, idx):
+        p = self._mp.Process(target=self.target, name='solclient-worker-{}'.format(idx),
+                args=(idx, self.props, self.handler, self.shardTopics(idx),
+                    self.queueName, self._statsQueue, self._stop, self.statsInterval))
+        p.start()
+        self._procs[idx] = p
+        self._startedAt[idx] = time.monotonic()
+
+    def _supervise(self):
+        while not self._stop.wait(min(self.statsInterval, self.restartBackoff)):
+            # drained every tick, a full pipe would block workers at exit
+            self.stats()
+            now = time.monotonic()
+            for idx, p in enumerate(self._procs):
+                if p is None or p.is_alive() or self._stop.is_set():
+                    continue
+
+                if self._retryAt[idx] is None:
+                    LOG.log(LOG.ERROR, 'ShardedConsumer - worker {} exited with {}\n'.format(idx, p.exitcode))
+                    if not self.restart or (self.maxRestarts is not None and self.restarts[idx] >= self.maxRestarts):
+                        self._procs[idx] = None
+                        continue
+                    # a worker that stayed up for a while starts over from restartBackoff
+                    quick = now - self._startedAt[idx] < self.maxBackoff
+                    self._failures[idx] = self._failures[idx] + 1 if quick else 1
+                    self._retryAt[idx] = now + min(self.restartBackoff * 2 ** (self._failures[idx] - 1), self.maxBackoff)
+
+                if now >= self._retryAt[idx]:
+                    self._retryAt[idx] = None
+                    self.restarts[idx] += 1
+                    self._spawn(idx)
+
+    def stats(self):
+        # latest counters per worker index
+        with self._statsLock:
+            while True:
+                try:
+                    idx, counters = self._statsQueue.get_nowait()
+                except queue.Empty:
+                    break
+                self._stats[idx] = counters
+            for idx, counters in self._stats.items():
+                counters['restarts'] = self.restarts[idx]
+            return self._stats
+
+    def stop(self, timeout=10.0):
+        # workers still up after timeout seconds are terminated
+        self._stop.set()
+        if self._supervisor is not None:
+            self._supervisor.join()
+        deadline = time.monotonic() + timeout
+        for p in self._procs:
+            if p is None:
+                continue
+            # keep draining the stats queue, a worker cannot exit with it full
+            while p.is_alive() and time.monotonic() < deadline:
+                p.join(0.05)
+                self.stats()
+            if p.is_alive():
+                p.terminate()
+                p.join()
+        return self.stats()
+
+def _shardedConsumerMain(idx, props, handler, topics, queueName, stats, stop, statsInterval):
+    counters = { 'pid': os.getpid(), 'received': 0, 'errors': 0 }
+
+    def rxMsg(opaque_p, msg_p, user_p):
+        counters['received'] += 1
+        try:
+            handler(Message(msg_p))
+        except Exception as e:
+            counters['errors'] += 1
+            LOG.log(LOG.ERROR, 'ShardedConsumer handler - {}\n'.format(e))
+        return CALLBACK_TAKE_MSG
+
+    context = Context()
+    funcInfo = SessionFuncInfo()
+    funcInfo.setMsgCallback(rxMsg)
+    funcInfo.setEventCallback(_defaultEventCallback)
+    session = Session(context, SessionProperties(**props), funcInfo)
+    session.connect()
+
+    for topic in topics:
+        session.topicSubscribe(topic)
+
+    flow = None
+    if queueName:
+        flowInfo = FlowFuncInfo()
+        flowInfo.setMsgCallback(rxMsg)
+        flowInfo.setEventCallback(_defaultEventCallback)
+        flow = Flow(session, FlowProperties(BIND_ENTITY_ID=FlowProperties.BIND_ENTITY_QUEUE,
+            BIND_NAME=queueName), flowInfo)
+
+    while not stop.wait(statsInterval):
+        stats.put((idx, dict(counters)))
+
+    del flow
+    session.disconnect()
+    stats.put((idx, dict(counters)))
+
+"""
+PartitionedPublisher spreads publishing over several sessions. Each message
+goes to the partition picked by a stable hash of its key, so per-key order
+holds while throughput scales with the number of connections. Guaranteed
+messages are tracked per partition with a CorrelationRegistry. When a
+session reports DOWN_ERROR its in-flight messages are settled as rejected
+and its keys move to the next live partition until it is up again.
+"""
+class PartitionedPublisher:
+    class Partition:
+        def __init__(self, index, registry):
+            self.index = index
+            self.registry = registry
+            self.session = None
+            self.up = False
+            self.sent = 0
+
+    def __init__(self, props, partitions=2, contexts=None, onSettled=None):
+        if not contexts:
+            # one context thread per partition
+            contexts = [ Context() for _ in range(partitions) ]
+        self.contexts = contexts
+        self.partitions = []
+
+        for idx in range(partitions):
+            part = self.Partition(idx, CorrelationRegistry.fromProps(props, onSettled))
+            funcInfo = SessionFuncInfo()
+            funcInfo.setMsgCallback(lambda session_p, msg_p, user_p: CALLBACK_OK)
+            funcInfo.setEventCallback(self._eventCallback(part))
+            part.session = Session(contexts[idx % len(contexts)], props, funcInfo)
+            self.partitions.append(part)
+
+    @staticmethod
+    def _eventCallback(part):
+        def onEvent(session_p, eventInfo_p, user_p):
+            event = eventInfo_p.contents.sessionEvent
+            if event == SessionEvent.ACKNOWLEDGEMENT or \
+                event == SessionEvent.REJECTED_MSG_ERROR:
+                    part.registry.onEvent(eventInfo_p)
+                    return
+
+            if event == SessionEvent.UP_NOTICE or \
+                event == SessionEvent.RECONNECTED_NOTICE:
+                    part.up = True
+            elif event == SessionEvent.DOWN_ERROR:
+                part.up = False
+                part.registry.failAll()
+            _defaultEventCallback(session_p, eventInfo_p, user_p)
+        return onEvent
+
+    def connect(self):
+        for part in self.partitions:
+            # up is set by UP_NOTICE, connect() may return before that
+            part.session.connect()
+
+    def disconnect(self):
+        for part in self.partitions:
+            part.up = False
+            part.session.disconnect()
+
+    def partitionFor(self, key):
+        n = len(self.partitions)
+        idx = zlib.crc32(_toBytes(key)) % n
+        for probe in range(n):
+            part = self.partitions[(idx + probe) % n]
+            if part.up:
+                return part
+        raise SolaceError(ReturnCode.FAIL, 'PartitionedPublisher - no partition is up')
+
+    def send(self, msg, key, obj=None, timeout=None):
+        # obj is handed to onSettled(obj, accepted) for guaranteed messages
+        part = self.partitionFor(key)
+        tag = None
+        if msg.getDelivery() != Message.DELIVERY_MODE_DIRECT:
+            tag = part.registry.track(msg, obj, timeout)
+            if tag is None:
+                return ReturnCode.WOULD_BLOCK
+
+        try:
+            rc = part.session.sendMsg(msg)
+        except:
+            if tag is not None:
+                part.registry.cancel(tag)
+            raise
+
+        if rc == ReturnCode.WOULD_BLOCK:
+            if tag is not None:
+                part.registry.cancel(tag)
+        else:
+            part.sent += 1
+        return rc
+
+    def wait(self, timeout=None):
+        return all(part.registry.wait(timeout) for part in self.partitions)
+
+    def stats(self):
+        return [ { 'up': part.up, 'sent': part.sent, 'inFlight': len(part.registry),
+                    'acked': part.registry.acked, 'rejected': part.registry.rejected }
+                for part in self.partitions ]
+
+class _SubscriptionBatch:
+    def __init__(self):
+        self.errors = {}
+        self._topics = {}
+        self._cond = threading.Condition()
+
+    def add(self, corrId, topic):
+        self._topics[corrId] = topic
+
+    def topic(self, corrId):
+        return self._topics.get(corrId)
+
+    def settle(self, corrId, topic, error):
+        with self._cond:
+            self._topics.pop(corrId, None)
+            if error is not None:
+                self.errors[topic] = error
+            self._cond.notify_all()
+
+    def unconfirmed(self):
+        with self._cond:
+            return list(self._topics.items())
+
+    def wait(self, timeout):
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._topics, timeout)
+
+class TransactedSession:
+    MAX_SESSION_NAME_LENGTH = 64
+
+# Dest
+class Destination(Structure):
+    _fields_ = [ ('destType', c_int), ('dest', c_char_p) ]
+
+    # ENUM destination types
+    (NULL, TOPIC, QUEUE, TOPIC_TEMP, QUEUE_TEMP) = range(-1, 4)
+
+    def __init__(self, dest=None, destType=TOPIC):
+        super().__init__(destType, _toBytes(dest))
+
+    def __eq__(self, other):
+        if not isinstance(other, Destination):
+            return NotImplemented
+        return self.destType == other.destType and self.dest == other.dest
+
+    def setDest(self, d):
+        self.dest = _toBytes(d)
+
+    # immutable and hashable Destination per (dest, destType), shared while
+    # it stays in a bounded LRU: identity is not guaranteed, compare with ==
+    @staticmethod
+    def intern(dest, destType=TOPIC):
+        return _internDestination(dest, destType)
+
+    @staticmethod
+    def internInfo():
+        return _internDestination.cache_info()
+
+class _InternedDestination(Destination):
+    def __init__(self, dest, destType):
+        super().__init__(dest, destType)
+        self.__dict__['_hash'] = hash((self.destType, self.dest))
+
+    def __setattr__(self, name, value):
+        if '_hash' in self.__dict__:
+            raise AttributeError('interned Destination is immutable')
+        super().__setattr__(name, value)
+
+    def __eq__(self, other):
+        return other is self or super().__eq__(other)
+
+    def __hash__(self):
+        return self._hash
+
+    def setDest(self, d):
+        raise AttributeError('interned Destination is immutable')
+
+_internDestination = lru_cache(maxsize=65536)(_InternedDestination)
+
+"""
+DestinationTemplate builds interned destinations from a pattern such as
+"md/{venue}/{sym}", parsed once. Destinations are cached by field values in
+a bounded LRU, so a repeated topic costs one cache lookup and no encoding.
+"""
+class DestinationTemplate:
+    def __init__(self, pattern, destType=Destination.TOPIC, cacheSize=4096):
+        self.pattern = pattern
+        self.destType = destType
+        self.fields = tuple(f for _, f, _, _ in string.Formatter().parse(pattern) if f is not None)
+        if not all(self.fields) or len(set(self.fields)) != len(self.fields):
+            raise ValueError('template fields must be named and unique: ' + pattern)
+        self._lookup = lru_cache(maxsize=cacheSize)(self._build)
+
+    def _build(self, *values):
+        return Destination.intern(self.pattern.format(**dict(zip(self.fields, values))), self.destType)
+
+    def __call__(self, *args, **kwargs):
+        if kwargs:
+            args += tuple(kwargs[f] for f in self.fields[len(args):])
+        if len(args) != len(self.fields):
+            raise TypeError('{} expects fields {}'.format(self.pattern, self.fields))
+        return self._lookup(*args)
+
+    def cacheInfo(self):
+        return self._lookup.cache_info()
+
+# encoded topic of a str, bytes or Destination
+def _topicBytes(topic):
+    if isinstance(topic, Destination):
+        return topic.dest
+    return _toBytes(topic)
+
+# the same as a str, as kept in Session.subscriptions
+def _topicName(topic):
+    return topic if isinstance(topic, str) else _topicBytes(topic).decode()
+
+def _asDestination(d):
+    return d if isinstance(d, Destination) else Destination.intern(d)
+
+# Message
+class Message:
+    (COS_1, COS_2, COS_3) = range(3)
+    (DELIVERY_MODE_DIRECT, DELIVERY_MODE_PERSISTENT, DELIVERY_MODE_NONPERSISTENT) = ( 0x00, 0x10, 0x20 )
+
+    _alloc = _lib.solClient_msg_alloc
+    _alloc.argtypes = [c_void_p]
+    _alloc.restype  = c_int
+    _alloc.errcheck = ReturnCode.raiseNotOK
+    def __init__(self, pt = None):
+        if pt is None:
+            self._pt = c_void_p()
+            self._alloc(byref(self._pt))
+        else:
+            self._pt = cast(pt, c_void_p)
+
+    _setAppMsgId = _lib.solClient_msg_setApplicationMessageId
+    _setAppMsgId.argtypes = [c_void_p, c_char_p]
+    _setAppMsgId.restype  = c_int
+    _setAppMsgId.errcheck = ReturnCode.raiseNotOK
+    def setAppMsgId(self, id):
+        self._setAppMsgId(self._pt, _toBytes(id))
+
+    _setBinaryAttachment = _lib.solClient_msg_setBinaryAttachment
+    _setBinaryAttachment.argtypes = [c_void_p, c_void_p, c_uint32]
+    _setBinaryAttachment.restype  = c_int
+    _setBinaryAttachment.errcheck = ReturnCode.raiseNotOK
+    def setBinaryAttachment(self, bytes):
+        # bytes are copied into the message
+        self._setBinaryAttachment(self._pt, bytes, 0 if bytes is None else len(bytes))
+        self._unpin()
+
+    _setBinaryAttachmentPtr = _lib.solClient_msg_setBinaryAttachmentPtr
+    _setBinaryAttachmentPtr.argtypes = [c_void_p, c_void_p, c_uint32]
+    _setBinaryAttachmentPtr.restype  = c_int
+    _setBinaryAttachmentPtr.errcheck = ReturnCode.raiseNotOK
+    def setBinaryAttachmentPtr(self, buf):
+        # any contiguous buffer; it is referenced, not copied, and stays
+        # pinned until the message is reset, freed or given another pointer
+        pin = _BufferPin(buf)
+        try:
+            self._setBinaryAttachmentPtr(self._pt, pin.view.buf, pin.view.len)
+        except:
+            pin.release()
+            raise
+        self._unpin()
+        self._pinned = pin
+
+    def _unpin(self):
+        pin = self.__dict__.pop('_pinned', None)
+        if pin is not None:
+            pin.release()
+
+    _setCOS = _lib.solClient_msg_setClassOfService
+    _setCOS.argtypes = [c_void_p, c_uint32]
+    _setCOS.restype  = c_int
+    _setCOS.errcheck = ReturnCode.raiseNotOK
+    def setCOS(self, cos):
+        self._setCOS(self._pt, c_uint32(cos))
+
+    _setCorrId = _lib.solClient_msg_setCorrelationId
+    _setCorrId.argtypes = [c_void_p, c_char_p]
+    _setCorrId.restype  = c_int
+    _setCorrId.errcheck = ReturnCode.raiseNotOK
+    def setCorrId(self, corrId):
+        self._setCorrId(self._pt, _toBytes(corrId))
+
+    _setCorrTagPtr = _lib.solClient_msg_setCorrelationTagPtr
+    _setCorrTagPtr.argtypes = [c_void_p, c_void_p, c_size_t]
+    _setCorrTagPtr.restype  = c_int
+    _setCorrTagPtr.errcheck = ReturnCode.raiseNotOK
+    def setCorrTag(self, tag):
+        self.corrTag = tag
+        self._setCorrTagPtr(self._pt, byref(self.corrTag), sizeof(self.corrTag))
+
+    def setCorrTagPtr(self, tag, size):
+        self._setCorrTagPtr(self._pt, tag, size)
+
+    _setDTO = _lib.solClient_msg_setDeliverToOne
+    _setDTO.argtypes = [c_void_p, c_ubyte]
+    _setDTO.restype  = c_int
+    _setDTO.errcheck = ReturnCode.raiseNotOK
+    def setDTO(self, dto):
+        self._setDTO(self._pt, c_ubyte(1 if dto else 0))
+
+    _setDelivery = _lib.solClient_msg_setDeliveryMode
+    _setDelivery.argtypes = [c_void_p, c_uint32]
+    _setDelivery.restype  = c_int
+    _setDelivery.errcheck = ReturnCode.raiseNotOK
+    def setDelivery(self, mode):
+        self._setDelivery(self._pt, c_uint32(mode))
+
+    _setDest = _lib.solClient_msg_setDestination
+    _setDest.argtypes = [c_void_p, POINTER(Destination), c_size_t]
+    _setDest.restype  = c_int
+    _setDest.errcheck = ReturnCode.raiseNotOK
+    # d is a Destination, or a topic name to intern
+    def setDest(self, d):
+        d = _asDestination(d)
+        self._setDest(self._pt, byref(d), sizeof(d))
+
+    _setDMQ = _lib.solClient_msg_setDMQEligible
+    _setDMQ.argtypes = [c_void_p, c_ubyte]
+    _setDMQ.restype  = c_int
+    _setDMQ.errcheck = ReturnCode.raiseNotOK
+    def setDMQ(self, dmq):
+        self._setDMQ(self._pt, c_ubyte(1 if dmq else 0))
+
+    _setEliding = _lib.solClient_msg_setElidingEligible
+    _setEliding.argtypes = [c_void_p, c_ubyte]
+    _setEliding.restype  = c_int
+    _setEliding.errcheck = ReturnCode.raiseNotOK
+    def setEliding(self, elide):
+        self._setEliding(self._pt, c_ubyte(1 if elide else 0))
+
+    _setReplyTo = _lib.solClient_msg_setReplyTo
+    _setReplyTo.argtypes = [c_void_p, POINTER(Destination), c_size_t]
+    _setReplyTo.restype  = c_int
+    _setReplyTo.errcheck = ReturnCode.raiseNotOK
+    def setReplyTo(self, d):
+        d = _asDestination(d)
+        self._setReplyTo(self._pt, byref(d), sizeof(d))
+
+    _setSenderId = _lib.solClient_msg_setSenderId
+    _setSenderId.argtypes = [c_void_p, c_char_p]
+    _setSenderId.restype  = c_int
+    _setSenderId.errcheck = ReturnCode.raiseNotOK
+    def setSenderId(self, id):
+        self._setSenderId(self._pt, _toBytes(id))
+
+    _setSenderTimestamp = _lib.solClient_msg_setSenderTimestamp
+    _setSenderTimestamp.argtypes = [c_void_p, c_int64]
+    _setSenderTimestamp.restype  = c_int
+    _setSenderTimestamp.errcheck = ReturnCode.raiseNotOK
+    def setSenderTimestamp(self, ts):
+        self._setSenderTimestamp(self._pt, c_int64(ts))
+
+    _setSeqNum = _lib.solClient_msg_setSequenceNumber
+    _setSeqNum.argtypes = [c_void_p, c_int64]
+    _setSeqNum.restype  = c_int
+    _setSeqNum.errcheck = ReturnCode.raiseNotOK
+    def setSeqNum(self, n):
+        self._setSeqNum(self._pt, c_int64(n))
+
+    _setTTL = _lib.solClient_msg_setTimeToLive
+    _setTTL.argtypes = [c_void_p, c_int64]
+    _setTTL.restype  = c_int
+    _setTTL.errcheck = ReturnCode.raiseNotOK
+    def setTTL(self, ttl):
+        self._setTTL(self._pt, c_int64(ttl))
+
+    @classmethod
+    def _setters(cls):
+        # set* methods by property name, collected once per class
+        setters = cls.__dict__.get('_setterTable')
+        if setters is None:
+            setters = {}
+            for klass in reversed(cls.__mro__):
+                for name, f in vars(klass).items():
+                    if name[:3] == 'set' and inspect.isfunction(f):
+                        setters[name[3:]] = f
+            cls._setterTable = setters
+        return setters
+
+    def applyProps(self, **kwargs):
+        setters = self._setters()
+
+        errors = {}
+        for name, value in kwargs.items():
+            setter = setters.get(name)
+            if setter is None:
+                errors[name] = KeyError('set'+name)
+                continue
+            try:
+                setter(self, value)
+            except Exception as e:
+                errors[name] = e
+
+        return errors
+
+    _getAppMsgId = _lib.solClient_msg_getApplicationMessageId
+    _getAppMsgId.argtypes = [c_void_p, POINTER(c_char_p)]
+    _getAppMsgId.restype  = c_int
+    _getAppMsgId.errcheck = ReturnCode.returnRefParam1
+    def getAppMsgId(self):
+        return self._getAppMsgId(self._pt, byref(c_char_p())).decode()
+
+    _getBinaryAttachment = _lib.solClient_msg_getBinaryAttachmentPtr
+    _getBinaryAttachment.argtypes = [c_void_p, c_void_p, POINTER(c_uint32)]
+    _getBinaryAttachment.restype  = c_int
+    _getBinaryAttachment.errcheck = ReturnCode.returnRefCharArrayAsBytes
+    def getBinaryAttachment(self):
+        return self._getBinaryAttachment(self._pt, byref(c_void_p()), byref(c_uint32()))
+
+    # separate function object, the errcheck differs from _getBinaryAttachment
+    _getBinaryAttachmentArray = _lib['solClient_msg_getBinaryAttachmentPtr']
+    _getBinaryAttachmentArray.argtypes = [c_void_p, c_void_p, POINTER(c_uint32)]
+    _getBinaryAttachmentArray.restype  = c_int
+    _getBinaryAttachmentArray.errcheck = ReturnCode.returnRefCharArray
+    def getBinaryAttachmentView(self):
+        # read-only memoryview over the native attachment, no copy is made.
+        # if views are still referenced when the message is reset or freed,
+        # the native message is only freed after the last view goes away.
+        arr = self._getBinaryAttachmentArray(self._pt, byref(c_void_p()), byref(c_uint32()))
+        if arr is None:
+            return None
+
+        views = [ r for r in self.__dict__.get('_views', ()) if r() is not None ]
+        views.append(weakref.ref(arr))
+        self._views = views
+        return memoryview(arr).cast('B').toreadonly()
+
+    def _liveViews(self):
+        views = ( r() for r in self.__dict__.pop('_views', ()) )
+        return [ v for v in views if v is not None ]
+
+    _getCacheStatus = _lib.solClient_msg_isCacheMsg
+    _getCacheStatus.argtypes = [c_void_p]
+    _getCacheStatus.restype  = c_int
+    _getCacheStatus.errcheck = ReturnCode.returnRefParam1
+    def getCacheStatus(self):
+        return self._getCacheStatus(self._pt)
+
+    _getCOS = _lib.solClient_msg_getClassOfService
+    _getCOS.argtypes = [c_void_p, POINTER(c_uint32)]
+    _getCOS.restype  = c_int
+    _getCOS.errcheck = ReturnCode.returnRefParam1
+    def getCOS(self):
+        return self._getCOS(self._pt, byref(c_uint32()))
+
+    _getCorrId = _lib.solClient_msg_getCorrelationId
+    _getCorrId.argtypes = [c_void_p, POINTER(c_char_p)]
+    _getCorrId.restype  = c_int
+    _getCorrId.errcheck = ReturnCode.returnRefParam1
+    def getCorrId(self):
+        corrId = self._getCorrId(self._pt, byref(c_char_p()))
+        return None if corrId is None else corrId.decode()
+
+    _getDelivery = _lib.solClient_msg_getDeliveryMode
+    _getDelivery.argtypes = [c_void_p, POINTER(c_uint32)]
+    _getDelivery.restype  = c_int
+    _getDelivery.errcheck = ReturnCode.returnRefParam1
+    def getDelivery(self):
+        return self._getDelivery(self._pt, byref(c_uint32()))
+
+    _getDest = _lib.solClient_msg_getDestination
+    _getDest.argtypes = [c_void_p, POINTER(Destination), c_size_t]
+    _getDest.restype  = c_int
+    _getDest.errcheck = ReturnCode.returnRefParam1Obj
+    def getDest(self):
+        d = self._getDest(self._pt, byref(Destination()), sizeof(Destination))
+        # copy, the returned string points into the message
+        return None if d is None else Destination(d.dest, d.destType)
+
+    _getMsgId = _lib.solClient_msg_getMsgId
+    _getMsgId.argtypes = [c_void_p, POINTER(c_uint64)]
+    _getMsgId.restype  = c_int
+    _getMsgId.errcheck = ReturnCode.returnRefParam1
+    def getMsgId(self):
+        return self._getMsgId(self._pt, byref(c_uint64()))
+
+    @classmethod
+    def getMsgPtrId(cls, msg_p):
+        return cls._getMsgId(msg_p, byref(c_uint64()))
+
+    _getRcvTimestamp = _lib.solClient_msg_getRcvTimestamp
+    _getRcvTimestamp.argtypes = [c_void_p, POINTER(c_int64)]
+    _getRcvTimestamp.restype  = c_int
+    _getRcvTimestamp.errcheck = ReturnCode.returnRefParam1
+    def getRcvTimestamp(self):
+        return self._getRcvTimestamp(self._pt, byref(c_int64()))
+
+    _getSenderTimestamp = _lib.solClient_msg_getSenderTimestamp
+    _getSenderTimestamp.argtypes = [c_void_p, POINTER(c_int64)]
+    _getSenderTimestamp.restype  = c_int
+    _getSenderTimestamp.errcheck = ReturnCode.returnRefParam1
+    def getSenderTimestamp(self):
+        return self._getSenderTimestamp(self._pt, byref(c_int64()))
+
+    _getSeqNum = _lib.solClient_msg_getSequenceNumber
+    _getSeqNum.argtypes = [c_void_p, POINTER(c_int64)]
+    _getSeqNum.restype  = c_int
+    _getSeqNum.errcheck = ReturnCode.returnRefParam1
+    def getSeqNum(self):
+        return self._getSeqNum(self._pt, byref(c_int64()))
+
+    _getTTL = _lib.solClient_msg_getTimeToLive
+    _getTTL.argtypes = [c_void_p, POINTER(c_int64)]
+    _getTTL.restype  = c_int
+    _getTTL.errcheck = ReturnCode.returnRefParam1
+    def getTTL(self):
+        return self._getTTL(self._pt, byref(c_int64()))
+
+    _isDiscardIndicated = _lib.solClient_msg_isDiscardIndication
+    _isDiscardIndicated.argtypes = [c_void_p]
+    _isDiscardIndicated.restype  = c_ubyte
+    _isDiscardIndicated.errcheck = ReturnCode.returnBool
+    def isDiscardIndicated(self):
+        return self._isDiscardIndicated(self._pt)
+
+    _isDTO = _lib.solClient_msg_isDeliverToOne
+    _isDTO.argtypes = [c_void_p]
+    _isDTO.restype  = c_ubyte
+    _isDTO.errcheck = ReturnCode.returnBool
+    def isDTO(self):
+        return self._isDTO(self._pt)
+
+    _isDMQ = _lib.solClient_msg_isDMQEligible
+    _isDMQ.argtypes = [c_void_p]
+    _isDMQ.restype  = c_ubyte
+    _isDMQ.errcheck = ReturnCode.returnBool
+    def isDMQ(self):
+        return self._isDMQ(self._pt)
+
+    _isEliding = _lib.solClient_msg_isElidingEligible
+    _isEliding.argtypes = [c_void_p]
+    _isEliding.restype  = c_ubyte
+    _isEliding.errcheck = ReturnCode.returnBool
+    def isEliding(self):
+        return self._isEliding(self._pt)
+
+    _isRedelivered = _lib.solClient_msg_isRedelivered
+    _isRedelivered.argtypes = [c_void_p]
+    _isRedelivered.restype  = c_ubyte
+    _isRedelivered.errcheck = ReturnCode.returnBool
+    def isRedelivered(self):
+        return self._isRedelivered(self._pt)
+
+    _isReplyMsg = _lib.solClient_msg_isReplyMsg
+    _isReplyMsg.argtypes = [c_void_p]
+    _isReplyMsg.restype  = c_ubyte
+    _isReplyMsg.errcheck = ReturnCode.returnBool
+    def isReplyMsg(self):
+        return self._isReplyMsg(self._pt)
+
+    _dump = _lib.solClient_msg_dump
+    _dump.argtypes = [c_void_p, c_void_p, c_size_t]
+    _dump.restype  = c_int
+    _dump.errcheck = ReturnCode.raiseNotOK
+    def dump(self, buffer=None):
+        self._dump(self._pt, buffer, 0 if buffer is None else len(buffer))
+
+    @classmethod
+    def dumpPtr(cls, msg_p, buffer=None):
+        cls._dump(msg_p, buffer, 0 if buffer is None else len(buffer))
+
+    _dup = _lib.solClient_msg_dup
+    _dup.argtypes = [c_void_p, c_void_p]
+    _dup.restype  = c_int
+    _dup.errcheck = ReturnCode.raiseNotOK
+    def dup(self):
+        msg = type(self).__new__(type(self))
+        msg._pt = c_void_p()
+        self._dup(self._pt, byref(msg._pt))
+
+        # keep alive what the copied pointers refer to
+        if 'corrTag' in self.__dict__:
+            msg.corrTag = self.corrTag
+        if '_pinned' in self.__dict__:
+            msg._pinned = _BufferPin(self._pinned.obj)
+        return msg
+
+    _reset = _lib.solClient_msg_reset
+    _reset.argtypes = [c_void_p]
+    _reset.restype  = c_int
+    _reset.errcheck = ReturnCode.raiseNotOK
+    def reset(self):
+        # clears all fields of the native message, keeping its allocation
+        views = self._liveViews()
+        if views:
+            # attachment views still in use, swap in a fresh native message
+            _DeferredFree(self._pt, views, self.__dict__.pop('_pinned', None))
+            self._pt = c_void_p()
+            self._alloc(byref(self._pt))
+        else:
+            self._reset(self._pt)
+            self._unpin()
+        self.__dict__.pop('corrTag', None)
+
+    _free = _lib.solClient_msg_free
+    _free.argtypes = [ c_void_p ]
+    _free.restype  = c_int
+    _free.errcheck = ReturnCode.raiseNotOK
+    def __del__(self):
+        views = self._liveViews()
+        if views:
+            _DeferredFree(self._pt, views, self.__dict__.pop('_pinned', None))
+            return
+
+        try:
+            self._free(byref(self._pt))
+        except SolaceError as e:
+            LOG.log( LOG.ERROR, str(e) )
+            _lib.solClient_resetLastErrorInfo()
+        self._unpin()
+
+"""
+Frees a native message once every attachment view over it is collected.
+"""
+class _DeferredFree:
+    def __init__(self, pt, views, pin=None):
+        self._pt = pt
+        self._pin = pin
+        self._pending = len(views)
+        for v in views:
+            weakref.finalize(v, self._release)
+
+    def _release(self):
+        self._pending -= 1
+        if self._pending == 0:
+            try:
+                Message._free(byref(self._pt))
+            except SolaceError as e:
+                LOG.log( LOG.ERROR, str(e) )
+                _lib.solClient_resetLastErrorInfo()
+            if self._pin is not None:
+                self._pin.release()
+
+"""
+Holds a contiguous buffer export (bytes, bytearray, mmap, numpy, ...) so its
+address stays valid while a message points at it.
+"""
+class _Py_buffer(Structure):
+    _fields_ = [ ('buf', c_void_p), ('obj', c_void_p), ('len', c_ssize_t),
+            ('itemsize', c_ssize_t), ('readonly', c_int), ('ndim', c_int),
+            ('format', c_char_p), ('shape', c_void_p), ('strides', c_void_p),
+            ('suboffsets', c_void_p), ('internal', c_void_p) ]
+
+class _BufferPin:
+    PyBUF_SIMPLE = 0
+
+    _getBuffer = pythonapi.PyObject_GetBuffer
+    _getBuffer.argtypes = [py_object, POINTER(_Py_buffer), c_int]
+    _getBuffer.restype  = c_int
+
+    _releaseBuffer = pythonapi.PyBuffer_Release
+    _releaseBuffer.argtypes = [POINTER(_Py_buffer)]
+    _releaseBuffer.restype  = None
+
+    def __init__(self, obj):
+        self.obj = obj
+        self.view = _Py_buffer()
+        # raises BufferError for non-contiguous exporters
+        self._getBuffer(obj, byref(self.view), self.PyBUF_SIMPLE)
+        self._held = True
+
+    def release(self):
+        if self._held:
+            self._held = False
+            self._releaseBuffer(byref(self.view))
+
+    def __del__(self):
+        self.release()
+
+"""
+CorrelationRegistry tracks in-flight guaranteed messages by compact integer
+correlation tags, kept in a preallocated table of `window` slots. acquire()
+and track() block while `window` messages are outstanding, matching
+PUB_WINDOW_SIZE. Feed session events to onEvent(); with windowedAcks
+(ACK_EVENT_MODE_WINDOWED) one acknowledgement settles every message up to
+its tag. onSettled(obj, accepted) is called for each settled message.
+"""
+class CorrelationRegistry:
+    def __init__(self, window=int(SessionProperties.DEFAULT_PUB_WINDOW_SIZE), windowedAcks=False, onSettled=None):
+        self.window = window
+        self.windowedAcks = windowedAcks
+        self.onSettled = onSettled
+        self.acked = 0
+        self.rejected = 0
+
+        self._tags = [0] * window
+        self._objs = [None] * window
+        self._next = 1 # 0 is the NULL correlation tag
+        self._tail = 1 # oldest unsettled tag
+        self._inFlight = 0
+        self._cond = threading.Condition()
+
+    @classmethod
+    def fromProps(cls, props, onSettled=None):
+        d = props._props()
+        return cls(int(d.get('PUB_WINDOW_SIZE', SessionProperties.DEFAULT_PUB_WINDOW_SIZE)),
+                d.get('ACK_EVENT_MODE') == SessionProperties.ACK_EVENT_MODE_WINDOWED,
+                onSettled)
+
+    def __len__(self):
+        return self._inFlight
+
+    def acquire(self, obj=None, timeout=None):
+        # returns the tag, or None on timeout
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._next - self._tail < self.window, timeout):
+                return None
+            tag = self._next
+            self._next += 1
+            idx = tag % self.window
+            self._tags[idx] = tag
+            self._objs[idx] = obj
+            self._inFlight += 1
+        return tag
+
+    def track(self, msg, obj=None, timeout=None):
+        tag = self.acquire(obj, timeout)
+        if tag is not None:
+            msg.setCorrTagPtr(tag, 0)
+        return tag
+
+    def _settleOne(self, tag, accepted, settled):
+        idx = tag % self.window
+        if tag < self._tail or tag >= self._next or self._tags[idx] != tag:
+            return
+        settled.append((self._objs[idx], accepted))
+        self._tags[idx] = 0
+        self._objs[idx] = None
+        self._inFlight -= 1
+
+    def _advance(self):
+        while self._tail < self._next and self._tags[self._tail % self.window] != self._tail:
+            self._tail += 1
+
+    def cancel(self, tag):
+        # frees the tag of a message that was not sent, without onSettled
+        with self._cond:
+            self._settleOne(tag, False, [])
+            self._advance()
+            self._cond.notify_all()
+
+    def settle(self, tag, accepted=True):
+        settled = []
+        with self._cond:
+            if accepted and self.windowedAcks:
+                for t in range(self._tail, min(tag, self._next - 1) + 1):
+                    self._settleOne(t, True, settled)
+            else:
+                self._settleOne(tag, accepted, settled)
+
+            self._advance()
+
+            if accepted:
+                self.acked += len(settled)
+            else:
+                self.rejected += len(settled)
+            self._cond.notify_all()
+
+        if self.onSettled is not None:
+            for obj, acc in settled:
+                self.onSettled(obj, acc)
+        return settled
+
+    def onEvent(self, eventInfo_p):
+        info = eventInfo_p.contents
+        if info.sessionEvent == SessionEvent.ACKNOWLEDGEMENT:
+            return self.settle(info.correlation_p or 0, True)
+        if info.sessionEvent == SessionEvent.REJECTED_MSG_ERROR:
+            return self.settle(info.correlation_p or 0, False)
+        return None
+
+    def failAll(self):
+        # settles everything in flight as rejected, e.g. when the session goes down
+        with self._cond:
+            tags = [ t for t in self._tags if t ]
+        settled = []
+        for tag in sorted(tags):
+            settled.extend(self.settle(tag, False))
+        return settled
+
+    def wait(self, timeout=None):
+        # until nothing is in flight
+        with self._cond:
+            return self._cond.wait_for(lambda: self._inFlight == 0, timeout)
+
+"""
+MessageProps resolves the setters for a set of properties once,
+then applies them to many messages with the same error semantics as
+Message.applyProps().
+"""
+class MessageProps:
+    def __init__(self, msgClass=None, **kwargs):
+        setters = (msgClass or Message)._setters()
+        self._plan = [ (name, setters.get(name), value) for name, value in kwargs.items() ]
+
+    def apply(self, msg):
+        errors = {}
+        for name, setter, value in self._plan:
+            if setter is None:
+                errors[name] = KeyError('set'+name)
+                continue
+            try:
+                setter(msg, value)
+            except Exception as e:
+                errors[name] = e
+
+        return errors
+
+"""
+MessageTemplate holds a pre-populated message for the fields shared by
+many publishes. create() duplicates it natively and only sets the
+per-message fields, e.g.
+
+    t = MessageTemplate(Dest=Destination('a/b'), Delivery=Message.DELIVERY_MODE_PERSISTENT)
+    session.sendMsg(t.create(BinaryAttachment=payload, CorrTag=tag))
+"""
+class MessageTemplate:
+    def __init__(self, msgClass=None, **kwargs):
+        self.msgClass = msgClass or Message
+        self.msg = self.msgClass()
+        self._setters = self.msgClass._setters()
+        self.applyProps(**kwargs)
+
+    def applyProps(self, **kwargs):
+        errors = self.msg.applyProps(**kwargs)
+        if errors:
+            name, e = next(iter(errors.items()))
+            raise ValueError('Cannot set {} on template: {}'.format(name, e)) from e
+
+    def create(self, **kwargs):
+        # unknown names fail as in Message.applyProps(), before anything is set
+        setters = [ (self._setters.get(name), name, value) for name, value in kwargs.items() ]
+        for setter, name, value in setters:
+            if setter is None:
+                raise KeyError('set'+name)
+
+        msg = self.msg.dup()
+        for setter, name, value in setters:
+            setter(msg, value)
+        return msg
+
+"""
+MessagePool hands out reset messages instead of allocating one per publish.
+Messages go back with release(), or through releaseAcked() from the session
+event callback once a guaranteed message is acknowledged or rejected; call
+releaseOnAck() in send order. With windowedAcks (ACK_EVENT_MODE_WINDOWED) one
+acknowledgement releases every message up to its tag. Released messages
+beyond maxSize are freed.
+"""
+class MessagePool:
+    def __init__(self, maxSize=1024, windowedAcks=False):
+        self.maxSize = maxSize
+        self.windowedAcks = windowedAcks
+        self._free = deque()
+        self._unacked = {}
+        self.hits = 0
+        self.misses = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self._free)
+
+    def acquire(self):
+        try:
+            msg = self._free.pop()
+        except IndexError:
+            self.misses += 1
+            return Message()
+        self.hits += 1
+        return msg
+
+    def release(self, msg):
+        if len(self._free) >= self.maxSize:
+            self.dropped += 1
+            return
+        msg.reset()
+        self._free.append(msg)
+
+    def releaseOnAck(self, msg):
+        # the native message pointer doubles as the correlation tag
+        self._unacked[msg._pt.value] = msg
+        msg.setCorrTagPtr(msg._pt, 0)
+
+    def releaseAcked(self, eventInfo_p):
+        info = eventInfo_p.contents
+        if info.sessionEvent != SessionEvent.ACKNOWLEDGEMENT and \
+            info.sessionEvent != SessionEvent.REJECTED_MSG_ERROR:
+                return False
+
+        tag = info.correlation_p
+        if tag not in self._unacked:
+            return False
+        if info.sessionEvent == SessionEvent.REJECTED_MSG_ERROR or not self.windowedAcks:
+            self.release(self._unacked.pop(tag))
+            return True
+
+        # in send order, up to and including tag
+        unacked = self._unacked
+        while True:
+            t = next(iter(unacked))
+            self.release(unacked.pop(t))
+            if t == tag:
+                return True
+
+    def stats(self):
+        return { 'hits': self.hits, 'misses': self.misses, 'dropped': self.dropped,
+                'free': len(self._free), 'unacked': len(self._unacked) }
+
+###################
+# Instrumentation
+###################
+
+"""
+LatencyHistogram counts integer values (e.g. nanoseconds) in log-linear
+buckets, HDR style: 2**SUB_BITS buckets per power of two, so percentiles are
+within about 3%. Only buckets that were hit are kept, so a histogram costs
+a few dict entries rather than all SIZE buckets. Histograms merge with
+merge() or +=, and toDict()/fromDict() give a compact form for passing
+between processes.
+"""
+class LatencyHistogram:
+    SUB_BITS = 5
+    SIZE = (65 - SUB_BITS) << SUB_BITS
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    @classmethod
+    def _index(cls, value):
+        shift = value.bit_length() - cls.SUB_BITS - 1
+        if shift <= 0:
+            return value
+        return (shift << cls.SUB_BITS) + (value >> shift)
+
+    @classmethod
+    def _upper(cls, idx):
+        shift = (idx >> cls.SUB_BITS) - 1
+        if shift <= 0:
+            return idx
+        return ((idx - (shift << cls.SUB_BITS) + 1) << shift) - 1
+
+    def record(self, value):
+        value = min(max(int(value), 0), (1 << 64) - 1)
+        idx = self._index(value)
+        self.counts[idx] = self.counts.get(idx, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        if not other.count:
+            return self
+        counts = self.counts
+        for idx, n in other._items():
+            counts[idx] = counts.get(idx, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    __iadd__ = merge
+
+    def _items(self):
+        # the recording thread may add buckets while another thread reads
+        while True:
+            try:
+                return list(self.counts.items())
+            except RuntimeError:
+                continue
+
+    def reset(self):
+        self.__init__()
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def percentile(self, p):
+        if not self.count:
+            return None
+        target = max(1, -(-self.count * p // 100))
+        seen = 0
+        for idx, n in sorted(self._items()):
+            seen += n
+            if seen >= target:
+                return min(self._upper(idx), self.max)
+        return self.max
+
+    def summary(self, percentiles=(50, 90, 99, 99.9)):
+        out = { 'count': self.count, 'mean': self.mean, 'min': self.min, 'max': self.max }
+        out.update(('p{:g}'.format(p), self.percentile(p)) for p in percentiles)
+        return out
+
+    def toDict(self):
+        return { 'counts': dict(self._items()),
+                'count': self.count, 'total': self.total, 'min': self.min, 'max': self.max }
+
+    @classmethod
+    def fromDict(cls, d):
+        h = cls()
+        for idx, n in d['counts'].items():
+            h.counts[int(idx)] = n
+        h.count, h.total, h.min, h.max = d['count'], d['total'], d['min'], d['max']
+        return h
+
+# named LatencyHistograms per recording thread, merged on read; those of
+# finished threads are folded into one retired set
+class _ThreadHistograms:
+    def __init__(self):
+        self._local = threading.local()
+        self._threadHists = []
+        self._retired = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        hists = getattr(self._local, 'hists', None)
+        if hists is None:
+            hists = self._local.hists = {}
+            with self._lock:
+                self._prune()
+                self._threadHists.append((weakref.ref(threading.current_thread()), hists))
+        h = hists.get(name)
+        if h is None:
+            h = hists[name] = LatencyHistogram()
+        return h
+
+    def _prune(self):
+        # with self._lock held
+        live = []
+        for ref, hists in self._threadHists:
+            thread = ref()
+            if thread is not None and thread.is_alive():
+                live.append((ref, hists))
+                continue
+            for name, h in list(hists.items()):
+                self._retired.setdefault(name, LatencyHistogram()).merge(h)
+        self._threadHists = live
+
+    def merged(self):
+        merged = {}
+        with self._lock:
+            self._prune()
+            for hists in [ self._retired ] + [ hists for _, hists in self._threadHists ]:
+                for name, h in list(hists.items()):
+                    merged.setdefault(name, LatencyHistogram()).merge(h)
+        return merged
+
+    def reset(self):
+        with self._lock:
+            self._prune()
+            for hists in [ self._retired ] + [ hists for _, hists in self._threadHists ]:
+                for h in list(hists.values()):
+                    h.reset()
+
+def _report(hists, file, percentiles, scale, unit):
+    # prints a table by total; returns the summaries
+    merged = sorted(((n, h) for n, h in hists.items() if h.count), key=lambda nh: -nh[1].total)
+    summaries = { name: h.summary(percentiles) for name, h in merged }
+
+    cols = [ 'p{:g}'.format(p) for p in percentiles ] + [ 'max' ]
+    width = max([ len(n) for n in summaries ] + [ 4 ])
+    lines = [ '{:<{w}} {:>10} {:>12}'.format('name', 'count', 'total_' + unit, w=width) +
+            ''.join(' {:>10}'.format(c + '_' + unit) for c in cols) ]
+    for name, h in merged:
+        summary = summaries[name]
+        lines.append('{:<{w}} {:>10} {:>12.1f}'.format(name, h.count, h.total / scale, w=width) +
+                ''.join(' {:>10.2f}'.format(summary[c] / scale) for c in cols))
+    print('\n'.join(lines), file=file)
+    return summaries
+
+"""
+Opt-in timing of native calls and callbacks, as pysolclient.instrumentation.
+enable() replaces the native functions bound on the classes of this module
+with timing wrappers, recorded as e.g. Session._sendMsg, and the errcheck
+of each as errcheck:<function>; disable() puts the originals back, so there
+is no cost when off. Message and event callbacks set while enabled are
+timed as callback:<kind>. Each thread records into its own histograms,
+merged by histograms() and report().
+"""
+class Instrumentation:
+    def __init__(self):
+        self.enabled = False
+        self._patched = []
+        self._hists = _ThreadHistograms()
+        self._hist = self._hists.get
+        self._lock = threading.Lock()
+
+    def record(self, name, ns):
+        self._hist(name).record(ns)
+
+    def _timed(self, name, fn):
+        clock = time.perf_counter_ns
+        hist = self._hist
+        def timed(*args):
+            start = clock()
+            try:
+                return fn(*args)
+            finally:
+                hist(name).record(clock() - start)
+        timed.__wrapped__ = fn
+        return timed
+
+    def callback(self, kind, cb):
+        # cb timed as callback:<kind> while enabled
+        if not self.enabled:
+            return cb
+        name = 'callback:' + kind
+        clock = time.perf_counter_ns
+        def timed(*args):
+            if not self.enabled:
+                return cb(*args)
+            start = clock()
+            try:
+                return cb(*args)
+            finally:
+                self._hist(name).record(clock() - start)
+        timed.__wrapped__ = cb
+        return timed
+
+    def enable(self):
+        # only calls through the class attributes are timed: direct _lib.*
+        # calls, such as context create and destroy, and functions taken
+        # before enable() are not
+        with self._lock:
+            if self.enabled:
+                return
+            errchecks = {}
+            for cls in [ v for v in globals().values() if isinstance(v, type) and v.__module__ == __name__ ]:
+                for attr, v in list(vars(cls).items()):
+                    if not isinstance(v, (_CFuncPtr, _LazyFunc)):
+                        continue
+                    try:
+                        fn = getattr(cls, attr)
+                    except AttributeError:
+                        # symbol missing from this libsolclient
+                        continue
+                    name = '{}.{}'.format(cls.__name__, attr)
+                    self._patched.append((cls, attr, v))
+                    setattr(cls, attr, staticmethod(self._timed(name, fn)))
+
+                    check = fn.errcheck
+                    if check is not None and id(fn) not in errchecks:
+                        errchecks[id(fn)] = (fn, check)
+                        fn.errcheck = self._timed('errcheck:' + fn.__name__, check)
+            self._errchecks = list(errchecks.values())
+            self.enabled = True
+
+    def disable(self):
+        with self._lock:
+            if not self.enabled:
+                return
+            for cls, attr, v in reversed(self._patched):
+                setattr(cls, attr, v if not isinstance(v, _LazyFunc) else v._bind())
+            for fn, check in self._errchecks:
+                fn.errcheck = check
+            self._patched = []
+            self._errchecks = []
+            self.enabled = False
+
+    def reset(self):
+        self._hists.reset()
+
+    def histograms(self):
+        return self._hists.merged()
+
+    def report(self, file=None, percentiles=(50, 90, 99, 99.9)):
+        # microseconds per name, by total time
+        return _report(self.histograms(), file, percentiles, 1e3, 'us')
+
+# shared by the pysolclient.instrumentation submodule
+_instrumentation = Instrumentation()
+
+"""
+LatencyTracker records publish-to-receive latency per topic in milliseconds,
+from the sender timestamp of each message (GENERATE_SEND_TIMESTAMPS or
+stamp()) to its receive timestamp (GENERATE_RCV_TIMESTAMPS), or the local
+clock when there is none. Both timestamps are whole milliseconds, so that is
+the resolution. That is one-way latency within a host, or the round trip for
+messages reflected back to their publisher. Its message
+callback records and then hands the message to callback. snapshot() and
+merge() combine trackers of several processes.
+"""
+class LatencyTracker:
+    def __init__(self, callback=_defaultMsgCallback, percentiles=(50, 99, 99.9)):
+        self.next = callback
+        self.percentiles = percentiles
+        self.missing = 0
+        self._hists = _ThreadHistograms()
+        self._merged = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def stamp(msg):
+        msg.setSenderTimestamp(time.time_ns() // 1000000)
+
+    def callback(self, opaque_p, msg_p, user_p):
+        now = time.time_ns() // 1000000
+        sent = Message._getSenderTimestamp(msg_p, byref(c_int64()))
+        if sent is None:
+            self.missing += 1
+        else:
+            received = Message._getRcvTimestamp(msg_p, byref(c_int64()))
+            received = now if received is None else received
+            d = Destination()
+            d = Message._getDest(msg_p, byref(d), sizeof(d))
+            topic = '' if d is None else d.dest.decode()
+            self._hists.get(topic).record(received - sent)
+        return self.next(opaque_p, msg_p, user_p)
+
+    def histograms(self):
+        merged = self._hists.merged()
+        with self._lock:
+            for topic, h in self._merged.items():
+                merged.setdefault(topic, LatencyHistogram()).merge(h)
+        return merged
+
+    def snapshot(self):
+        return { topic: h.toDict() for topic, h in self.histograms().items() }
+
+    def merge(self, snapshot):
+        # snapshot() of another tracker
+        with self._lock:
+            for topic, d in snapshot.items():
+                self._merged.setdefault(topic, LatencyHistogram()).merge(LatencyHistogram.fromDict(d))
+
+    def summary(self):
+        return { topic: h.summary(self.percentiles) for topic, h in self.histograms().items() if h.count }
+
+    def report(self, file=None):
+        return _report(self.histograms(), file, self.percentiles, 1, 'ms')
+
+    def reset(self):
+        self._hists.reset()
+        with self._lock:
+            self._merged = {}
+        self.missing = 0
+
+def cleanup():
+    _lib.solClient_cleanup()
+
+import atexit
+
+def _initialize(lib):
+    # init, set to error
+    lib.solClient_initialize( LOG.ERROR, c_void_p() )
+    atexit.register(cleanup)
+
+if not LAZY_INIT:
+    _initialize(_lib)
+
+from . import instrumentation
@@ -0,0 +1,23 @@
+# Opt-in timing of native calls and callbacks, see Instrumentation:
+#
+#   from pysolclient import instrumentation
+#   instrumentation.enable()
+#   ...
+#   instrumentation.report()
+#
+# The functions act on the one Instrumentation used by the package.
+
+from . import _instrumentation
+
+enable = _instrumentation.enable
+disable = _instrumentation.disable
+reset = _instrumentation.reset
+record = _instrumentation.record
+callback = _instrumentation.callback
+histograms = _instrumentation.histograms
+report = _instrumentation.report
+
+def __getattr__(name):
+    if name == 'enabled':
+        return _instrumentation.enabled
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
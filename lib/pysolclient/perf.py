@@ -0,0 +1,294 @@
+# Throughput and latency harness, sdkperf style:
+#
+#   python -m pysolclient.perf -P 2 -S 2 -n 100000 -s 100,1000 -T 8
+#
+# Native messages are moved by LoopbackTransport, an in-process stand-in for
+# sessions on a broker, so no broker is needed; with --host they go through
+# sessions on that broker instead. Results are printed as JSON.
+
+import argparse
+import json
+import queue
+import threading
+import time
+from ctypes import byref, c_int64, c_void_p, sizeof
+
+from . import (CALLBACK_OK, CALLBACK_TAKE_MSG, Context, CorrelationRegistry, Destination,
+        LatencyHistogram, Message, Session, SessionFuncInfo, SessionProperties, SubscribeFlags,
+        TopicRouter, _defaultEventCallback)
+
+# message sequence numbers are publisher << SEQ_BITS | n
+SEQ_BITS = 40
+SEQ_MASK = (1 << SEQ_BITS) - 1
+
+DELIVERY = {
+    'direct': Message.DELIVERY_MODE_DIRECT,
+    'persistent': Message.DELIVERY_MODE_PERSISTENT,
+    'nonpersistent': Message.DELIVERY_MODE_NONPERSISTENT,
+}
+
+"""
+LoopbackTransport stands in for sessions on a broker. send() copies the
+message, as solClient_session_sendMsg() would, onto a bounded queue and
+blocks while it is full. A delivery thread, like a context thread, calls the
+message callback of every matching subscription with its own copy, which the
+callback may take (CALLBACK_TAKE_MSG), then calls onSent() as the
+acknowledgement of a guaranteed message.
+"""
+class LoopbackTransport:
+    def __init__(self, queueDepth=10000):
+        self.router = TopicRouter(fallback=lambda session_p, msg_p, user_p: CALLBACK_OK)
+        self.delivered = 0
+        self._queue = queue.Queue(queueDepth)
+        self._thread = threading.Thread(target=self._run, name='LoopbackTransport', daemon=True)
+        self._thread.start()
+
+    def subscribe(self, topic, callback, user=None):
+        self.router.add(topic, callback, user)
+
+    def send(self, msg, onSent=None):
+        msg_p = c_void_p()
+        Message._dup(msg._pt, byref(msg_p))
+        self._queue.put((msg_p, onSent))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            msg_p, onSent = item
+
+            d = Destination()
+            d = Message._getDest(msg_p, byref(d), sizeof(d))
+            for callback, user in (self.router.match(d.dest) if d is not None else ()):
+                copy_p = c_void_p()
+                Message._dup(msg_p, byref(copy_p))
+                if callback(None, copy_p.value, user) != CALLBACK_TAKE_MSG:
+                    Message._free(byref(copy_p))
+                self.delivered += 1
+            Message._free(byref(msg_p))
+
+            if onSent is not None:
+                onSent()
+
+    def close(self):
+        # returns once everything sent is delivered
+        self._queue.put(None)
+        self._thread.join()
+
+"""
+SessionTransport moves the messages through a broker: one Context, a Session
+per subscription and one publishing Session shared by the publisher threads.
+Guaranteed messages are tracked with a CorrelationRegistry and onSent() is
+called when they are acknowledged or rejected.
+"""
+class SessionTransport:
+    def __init__(self, cfg):
+        self.delivered = 0
+        self.expected = cfg.publishers * cfg.messages * cfg.subscribers
+        self.context = Context()
+        self.props = SessionProperties(HOST=cfg.host, VPN_NAME=cfg.vpn, USERNAME=cfg.username,
+                PASSWORD=cfg.password, PUB_WINDOW_SIZE=str(min(cfg.window, 255)))
+        self.registry = CorrelationRegistry.fromProps(self.props,
+                lambda onSent, accepted: onSent())
+        self.subscribers = []
+
+        funcInfo = SessionFuncInfo()
+        funcInfo.setMsgCallback(lambda session_p, msg_p, user_p: CALLBACK_OK)
+        funcInfo.setEventCallback(self._onPublisherEvent)
+        self.publisher = Session(self.context, self.props, funcInfo)
+        self.publisher.connect()
+
+    def _onPublisherEvent(self, session_p, eventInfo_p, user_p):
+        if self.registry.onEvent(eventInfo_p) is None:
+            _defaultEventCallback(session_p, eventInfo_p, user_p)
+
+    def subscribe(self, topic, callback, user=None):
+        def onMsg(session_p, msg_p, user_p):
+            # all sessions share the one context thread
+            self.delivered += 1
+            return callback(session_p, msg_p, user)
+
+        funcInfo = SessionFuncInfo()
+        funcInfo.setMsgCallback(onMsg)
+        funcInfo.setEventCallback(_defaultEventCallback)
+        session = Session(self.context, self.props, funcInfo)
+        session.connect()
+        session.topicSubscribe(topic, SubscribeFlags.WAITFORCONFIRM)
+        self.subscribers.append(session)
+
+    def send(self, msg, onSent=None):
+        tag = self.registry.track(msg, onSent) if onSent is not None else None
+        try:
+            self.publisher.sendMsg(msg)
+        except:
+            if tag is not None:
+                self.registry.cancel(tag)
+            raise
+
+    def close(self, idle=1.0):
+        # returns once the expected messages are delivered, or none for idle seconds
+        last, since = self.delivered, time.monotonic()
+        while self.delivered < self.expected:
+            time.sleep(0.01)
+            if self.delivered != last:
+                last, since = self.delivered, time.monotonic()
+            elif time.monotonic() - since >= idle:
+                break
+        for session in self.subscribers + [ self.publisher ]:
+            session.disconnect()
+
+class Subscriber:
+    def __init__(self, sentAt):
+        self.sentAt = sentAt
+        self.latency = LatencyHistogram()
+        self.received = 0
+        self.duplicates = 0
+        self.foreign = 0
+        self.last = None
+        self._next = [0] * len(sentAt)
+
+    def callback(self, opaque_p, msg_p, user_p):
+        now = time.perf_counter_ns()
+        seq = Message._getSeqNum(msg_p, byref(c_int64()))
+        pub, n = (seq >> SEQ_BITS, seq & SEQ_MASK) if seq is not None else (None, None)
+        # anything on perf/* that this run did not send
+        if pub is None or pub >= len(self.sentAt) or n >= len(self.sentAt[pub]) or not self.sentAt[pub][n]:
+            self.foreign += 1
+            return CALLBACK_OK
+        self.latency.record(now - self.sentAt[pub][n])
+
+        # per publisher order is kept, so anything behind is a duplicate
+        if n < self._next[pub]:
+            self.duplicates += 1
+        else:
+            self._next[pub] = n + 1
+        self.received += 1
+        self.last = now
+        return CALLBACK_OK
+
+def _publish(idx, cfg, payload, transport, sentAt):
+    msg = Message()
+    msg.setBinaryAttachment(payload)
+    msg.setDelivery(DELIVERY[cfg.delivery])
+    dests = [ Destination.intern('perf/{}'.format(t)) for t in range(cfg.topics) ]
+
+    # guaranteed messages are limited to window unacknowledged
+    window = threading.Semaphore(cfg.window) if cfg.delivery != 'direct' else None
+    onSent = window.release if window is not None else None
+    interval = 1.0 / cfg.rate if cfg.rate else 0
+    base = idx << SEQ_BITS
+    times = sentAt[idx]
+
+    start = time.perf_counter()
+    for n in range(cfg.messages):
+        if interval:
+            delay = start + n * interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        if window is not None:
+            window.acquire()
+        msg.setDest(dests[n % len(dests)])
+        msg.setSeqNum(base + n)
+        times[n] = time.perf_counter_ns()
+        transport.send(msg, onSent)
+
+    if window is not None:
+        for _ in range(cfg.window):
+            window.acquire()
+
+def run(cfg, payloadSize):
+    transport = SessionTransport(cfg) if cfg.host else LoopbackTransport(cfg.queueDepth)
+    sentAt = [ [0] * cfg.messages for _ in range(cfg.publishers) ]
+    subscribers = [ Subscriber(sentAt) for _ in range(cfg.subscribers) ]
+    for sub in subscribers:
+        transport.subscribe('perf/*', sub.callback)
+
+    payload = bytes(payloadSize)
+    publishers = [ threading.Thread(target=_publish, args=(idx, cfg, payload, transport, sentAt),
+            name='Publisher-{}'.format(idx)) for idx in range(cfg.publishers) ]
+
+    start = time.perf_counter_ns()
+    for t in publishers:
+        t.start()
+    for t in publishers:
+        t.join()
+    publishNs = time.perf_counter_ns() - start
+    transport.close()
+
+    last = [ sub.last for sub in subscribers if sub.last is not None ]
+    elapsed = ((max(last) if last else time.perf_counter_ns()) - start) / 1e9
+    published = cfg.publishers * cfg.messages
+    expected = published * cfg.subscribers
+    received = sum(sub.received for sub in subscribers)
+    duplicates = sum(sub.duplicates for sub in subscribers)
+    foreign = sum(sub.foreign for sub in subscribers)
+
+    latency = LatencyHistogram()
+    for sub in subscribers:
+        latency.merge(sub.latency)
+    summary = latency.summary((50, 90, 99, 99.9))
+
+    return {
+        'payload': payloadSize,
+        'published': published,
+        'expected': expected,
+        'received': received,
+        'lost': expected - (received - duplicates),
+        'duplicates': duplicates,
+        'foreign': foreign,
+        'elapsedSec': elapsed,
+        'publishMsgPerSec': published / (publishNs / 1e9) if publishNs else None,
+        'msgPerSec': received / elapsed if elapsed else None,
+        'mbPerSec': received * payloadSize / elapsed / 1e6 if elapsed else None,
+        'latencyUs': { k: (v / 1e3 if v is not None else None)
+            for k, v in summary.items() if k != 'count' },
+    }
+
+def parseArgs(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m pysolclient.perf',
+            description='pysolclient throughput and latency, over a loopback transport or a broker')
+    parser.add_argument('-P', '--publishers', type=int, default=1)
+    parser.add_argument('-S', '--subscribers', type=int, default=1)
+    parser.add_argument('-n', '--messages', type=int, default=10000, help='messages per publisher')
+    parser.add_argument('-s', '--payload', default='100',
+            help='payload sizes in bytes, comma separated, one run each')
+    parser.add_argument('-m', '--delivery', choices=sorted(DELIVERY), default='direct')
+    parser.add_argument('-T', '--topics', type=int, default=1, help='topics published to, round robin')
+    parser.add_argument('-r', '--rate', type=float, default=0, help='msg/s per publisher, 0 for unlimited')
+    parser.add_argument('-w', '--window', type=int, default=255, help='unacknowledged guaranteed messages')
+    parser.add_argument('-q', '--queue-depth', dest='queueDepth', type=int, default=10000,
+            help='loopback transport queue depth')
+    parser.add_argument('--host', help='broker to run through, instead of the loopback transport')
+    parser.add_argument('--vpn', default='default')
+    parser.add_argument('--username', default='default')
+    parser.add_argument('--password', default='')
+    parser.add_argument('-o', '--output', help='write the JSON here instead of stdout')
+    cfg = parser.parse_args(argv)
+    cfg.payload = [ int(size) for size in cfg.payload.split(',') ]
+    return cfg
+
+def main(argv=None):
+    cfg = parseArgs(argv)
+    result = {
+        'transport': 'session' if cfg.host else 'loopback',
+        'host': cfg.host,
+        'publishers': cfg.publishers,
+        'subscribers': cfg.subscribers,
+        'messages': cfg.messages,
+        'delivery': cfg.delivery,
+        'topics': cfg.topics,
+        'rate': cfg.rate,
+        'runs': [ run(cfg, size) for size in cfg.payload ],
+    }
+
+    text = json.dumps(result, indent=2)
+    if cfg.output:
+        with open(cfg.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    return result
+
+if __name__ == '__main__':
+    main()
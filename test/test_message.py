@@ -1,6 +1,10 @@
 from pysolclient import *
 from ctypes import *
 import inspect
+import time
+import pytest
+import pysolclient
+from pysolclient import instrumentation
 
 class TestMessageClass:
     @classmethod
@@ -24,6 +28,40 @@ class TestMessageClass:
 
         assert contents == attached
 
+    def test_binary_attachment_view(self):
+        contents = bytes(range(256)) * 16
+        msg = Message()
+        msg.setBinaryAttachment(contents)
+
+        view = msg.getBinaryAttachmentView()
+        assert view.readonly
+        assert view == contents
+
+        # view outlives the message, native free is deferred
+        del msg
+        assert bytes(view[:256]) == contents[:256]
+
+    def test_binary_attachment_ptr(self):
+        buf = bytearray(b'0123456789' * 100)
+        msg = Message()
+        msg.setBinaryAttachmentPtr(buf)
+        assert msg.getBinaryAttachment() == bytes(buf)
+
+        # the message sees changes made in place
+        buf[0:4] = b'abcd'
+        assert msg.getBinaryAttachment()[:4] == b'abcd'
+
+        # pinned, cannot resize until reset
+        pinned = False
+        try:
+            buf.append(0)
+        except BufferError:
+            pinned = True
+        assert pinned
+
+        msg.reset()
+        buf.append(0)
+
     def test_no_binary_attachment(self):
         self.msg.setBinaryAttachment(None)
         assert self.msg.getBinaryAttachment() is None
@@ -89,3 +127,454 @@ class TestMessageClass:
         d = Destination('some/topic/string')
         self.msg.setDest(d)
         assert self.msg.getDest() == d
+
+        self.msg.setDest('other/topic')
+        assert self.msg.getDest() == Destination.intern('other/topic')
+
+def test_message_pool():
+    pool = MessagePool(maxSize=2)
+
+    a = pool.acquire()
+    b = pool.acquire()
+    c = pool.acquire()
+    assert pool.misses == 3 and pool.hits == 0
+
+    a.setSeqNum(42)
+    for m in (a, b, c):
+        pool.release(m)
+    assert len(pool) == 2 and pool.dropped == 1
+
+    m = pool.acquire()
+    assert pool.hits == 1
+    assert m.getSeqNum() is None
+
+def test_message_pool_acks():
+    def event(kind, msg):
+        return pointer(EventCallbackInfo(kind, 0, b'', msg._pt.value))
+
+    for windowed, released in ((False, 2), (True, 3)):
+        pool = MessagePool(windowedAcks=windowed)
+        msgs = [ pool.acquire() for _ in range(4) ]
+        for m in msgs:
+            pool.releaseOnAck(m)
+
+        assert pool.releaseAcked(event(SessionEvent.REJECTED_MSG_ERROR, msgs[1]))
+        assert pool.releaseAcked(event(SessionEvent.ACKNOWLEDGEMENT, msgs[2]))
+        assert len(pool) == released and pool.stats()['unacked'] == 4 - released
+        assert not pool.releaseAcked(event(SessionEvent.ACKNOWLEDGEMENT, msgs[2]))
+
+def test_message_props():
+    props = MessageProps(SeqNum=7, COS=Message.COS_2, NoSuchProp=1)
+
+    for _ in range(3):
+        msg = Message()
+        errors = props.apply(msg)
+        assert list(errors) == ['NoSuchProp']
+        assert msg.getSeqNum() == 7
+        assert msg.getCOS() == Message.COS_2
+
+    errors = Message().applyProps(TTL=-1000, NoSuchProp=1)
+    assert isinstance(errors['TTL'], SolaceError)
+    assert isinstance(errors['NoSuchProp'], KeyError)
+
+def test_message_template():
+    template = MessageTemplate(COS=Message.COS_3, TTL=1000, DMQ=True)
+
+    for n in range(3):
+        msg = template.create(SeqNum=n, BinaryAttachment=b'payload')
+        assert msg.getSeqNum() == n
+        assert msg.getCOS() == Message.COS_3
+        assert msg.getTTL() == 1000
+        assert msg.isDMQ()
+        assert msg.getBinaryAttachment() == b'payload'
+
+    assert template.msg.getSeqNum() is None
+
+    with pytest.raises(ValueError):
+        MessageTemplate(TTL=-1000)
+    with pytest.raises(KeyError, match='setNoSuchField'):
+        template.create(SeqNum=1, NoSuchField=1)
+
+def test_correlation_registry():
+    settled = []
+    registry = CorrelationRegistry(window=4, onSettled=lambda o, a: settled.append((o, a)))
+
+    tags = [ registry.acquire(n) for n in range(4) ]
+    assert tags == [1, 2, 3, 4]
+    assert registry.acquire('full', timeout=0) is None
+
+    # out of order settle does not free the oldest slot
+    registry.settle(2)
+    registry.settle(3, accepted=False)
+    assert len(registry) == 2
+    assert registry.acquire('full', timeout=0) is None
+
+    registry.settle(1)
+    assert registry.acquire(4, timeout=0) == 5
+    assert settled == [(1, True), (2, False), (0, True)]
+    assert (registry.acked, registry.rejected) == (2, 1)
+
+    msg = Message()
+    assert registry.track(msg, 5, timeout=0) == 6
+
+    registry.cancel(6)
+    assert [ o for o, _ in registry.failAll() ] == [3, 4]
+    assert len(registry) == 0
+
+    windowed = CorrelationRegistry(window=8, windowedAcks=True)
+    for n in range(5):
+        windowed.acquire(n)
+    assert [ o for o, _ in windowed.settle(4) ] == [0, 1, 2, 3]
+    assert len(windowed) == 1
+
+def test_receive_buffer():
+    marks = []
+    buf = ReceiveBuffer(capacity=4, highWatermark=3, lowWatermark=1,
+            onHigh=lambda b: marks.append('high'), onLow=lambda b: marks.append('low'))
+
+    def rx(n):
+        msg_p = c_void_p()
+        Message._alloc(byref(msg_p))
+        Message._setSeqNum(msg_p, n)
+        return buf.callback(None, msg_p.value, None)
+
+    assert [ rx(n) for n in range(5) ] == [CALLBACK_TAKE_MSG] * 4 + [CALLBACK_OK]
+    assert buf.dropped == 1 and marks == ['high']
+
+    assert [ m.getSeqNum() for m in buf.drain(3) ] == [0, 1, 2]
+    assert marks == ['high', 'low']
+
+    assert [ m.getSeqNum() for m in buf.messages(timeout=0.01) ] == [3]
+    assert buf.get(timeout=0) is None
+
+def test_receive_buffer_overflow():
+    highs = []
+    buf = ReceiveBuffer(capacity=8, onHigh=highs.append)
+    assert (buf.highWatermark, buf.lowWatermark) == (6, 4)
+
+    results = []
+    for n in range(10):
+        msg_p = c_void_p()
+        Message._alloc(byref(msg_p))
+        results.append(buf.callback(None, msg_p.value, None))
+        if results[-1] != CALLBACK_TAKE_MSG:
+            Message(msg_p.value)
+        if n == 5:
+            # room left for what is in flight when onHigh fires
+            assert highs == [ buf ] and len(buf) < buf.capacity
+
+    assert results == [CALLBACK_TAKE_MSG] * 8 + [CALLBACK_OK] * 2
+    assert (buf.received, buf.dropped) == (8, 2)
+    buf.close()
+
+    funcInfo = FlowFuncInfo()
+    funcInfo.setReceiveBuffer(ReceiveBuffer(capacity=4))
+    with pytest.raises(ValueError):
+        Flow._checkAckMode(FlowProperties(), funcInfo)
+    with pytest.raises(ValueError):
+        Flow._checkAckMode(FlowProperties(ACKMODE=FlowProperties.ACKMODE_AUTO), funcInfo)
+    Flow._checkAckMode(FlowProperties(ACKMODE=FlowProperties.ACKMODE_CLIENT), funcInfo)
+    Flow._checkAckMode(FlowProperties(), FlowFuncInfo())
+
+def test_receive_buffer_cleanup(monkeypatch):
+    import gc
+    import sys
+    unraisable = []
+    monkeypatch.setattr(sys, 'unraisablehook', unraisable.append)
+
+    # a rejected Flow is collected quietly
+    funcInfo = FlowFuncInfo()
+    funcInfo.setReceiveBuffer(ReceiveBuffer(capacity=4))
+    with pytest.raises(ValueError):
+        Flow(None, FlowProperties(), funcInfo)
+    gc.collect()
+    assert unraisable == []
+
+    # buffered messages are freed with the buffer
+    freed = []
+    buf = ReceiveBuffer(capacity=4)
+    for _ in range(3):
+        msg_p = c_void_p()
+        Message._alloc(byref(msg_p))
+        buf.callback(None, msg_p.value, None)
+    free = Message.__del__
+    monkeypatch.setattr(Message, '__del__', lambda self: freed.append(self._pt.value) or free(self))
+    del buf
+    gc.collect()
+    assert len(freed) == 3 and unraisable == []
+
+def test_sharded_dispatcher():
+    import threading
+    seen = {}
+    def handler(msg):
+        seen.setdefault(msg.getDest().dest, []).append((msg.getSeqNum(), threading.current_thread().name))
+
+    dispatcher = ShardedDispatcher(handler, shards=3)
+    for n in range(60):
+        d = Destination('shard/{}'.format(n % 5))
+        msg_p = c_void_p()
+        Message._alloc(byref(msg_p))
+        Message._setDest(msg_p, pointer(d), sizeof(d))
+        Message._setSeqNum(msg_p, n)
+        assert dispatcher.callback(None, msg_p.value, None) == CALLBACK_TAKE_MSG
+    dispatcher.shutdown()
+
+    assert len(seen) == 5
+    for received in seen.values():
+        seqs = [ n for n, _ in received ]
+        assert seqs == sorted(seqs) and len(seqs) == 12
+        assert len(set(t for _, t in received)) == 1
+    assert sum(s['processed'] for s in dispatcher.stats()) == 60
+
+def test_topic_router():
+    router = TopicRouter(fallback=lambda s, m, u: 'fallback', cacheSize=2)
+    hit = lambda s, m, u: u
+    router.add('md/*/IBM', hit, 'star')
+    router.add('md/NY*/>', hit, 'prefix')
+    router.add('md/NYSE/IBM', hit, 'exact')
+    router.add('md/>', hit, 'rest')
+    router.add('md/a*b/c', hit, 'literal')
+
+    users = lambda t: [ u for _, u in router.match(t) ]
+    assert users('md/NYSE/IBM') == [ 'rest', 'exact', 'star', 'prefix' ]
+    assert users(b'md/LSE/IBM') == [ 'rest', 'star' ]
+    assert users('md/NYSE') == [ 'rest' ]
+    assert users('md') == []
+    assert users('md/NYX/a/b') == [ 'rest', 'prefix' ]
+    assert users('md/axb/c') == [ 'rest' ]
+    assert users('md/a*b/c') == [ 'rest', 'literal' ]
+    assert len(router._cache) == 2
+
+    assert router.remove('md/>', hit, 'rest')
+    assert not router.remove('md/>', hit, 'rest')
+    assert users('md/NYSE') == []
+
+    def take(s, m, u):
+        Message(m)
+        return CALLBACK_TAKE_MSG
+    router.add('take/>', take)
+    # handlers after the taker never see the freed message
+    router.add('take/*', lambda s, m, u: pytest.fail('called after CALLBACK_TAKE_MSG'))
+    assert router.count('take/>') == 1 and router.count('take/y') == 0
+
+    for topic, rc in (('md/LSE/IBM', CALLBACK_OK), ('take/x', CALLBACK_TAKE_MSG), ('other', 'fallback')):
+        d = Destination(topic)
+        msg_p = c_void_p()
+        Message._alloc(byref(msg_p))
+        Message._setDest(msg_p, pointer(d), sizeof(d))
+        assert router.callback(None, msg_p.value, None) == rc
+        if rc != CALLBACK_TAKE_MSG:
+            Message(msg_p.value)
+
+def test_batch_delivery():
+    import threading
+    batches = []
+    threads = set()
+    def deliver(msgs):
+        threads.add(threading.current_thread().name)
+        batches.append([ m.getSeqNum() for m in msgs ])
+    batch = BatchDelivery(deliver, max_batch=4, max_delay_us=20000)
+
+    def receive(seqNums):
+        for n in seqNums:
+            msg_p = c_void_p()
+            Message._alloc(byref(msg_p))
+            Message._setSeqNum(msg_p, n)
+            assert batch.callback(None, msg_p.value, None) == CALLBACK_TAKE_MSG
+
+    def waitFor(count):
+        deadline = time.monotonic() + 2
+        while len(batches) < count and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    # the full batch goes first, the rest after max_delay_us
+    receive(range(6))
+    waitFor(2)
+    assert batches == [ [0, 1, 2, 3], [4, 5] ]
+    assert batch.received == 6 and batch.batches == 2
+    assert threads == { 'BatchDelivery' }
+
+    # a backlog, here held up behind a delivery, is split into max_batch chunks
+    with batch._deliverLock:
+        receive(range(6, 15))
+        batch.flush()
+    assert batches[2:] == [ [6, 7, 8, 9], [10, 11, 12, 13], [14] ]
+
+    receive([ 15 ])
+    batch.close()
+    assert batches[-1] == [ 15 ] and batch.received == 16
+    assert batch.callback(None, None, None) == CALLBACK_OK
+
+def test_header_extractor():
+    pytest.importorskip('numpy')
+
+    msgs = []
+    for n in range(5):
+        msg = Message()
+        msg.applyProps(SeqNum=n, TTL=n * 1000, COS=Message.COS_2)
+        if n % 2:
+            msg.setBinaryAttachment(b'x' * n)
+            msg.setSenderTimestamp(1000 + n)
+        msgs.append(msg)
+
+    extractor = HeaderExtractor(capacity=2)
+    headers = extractor.extract(msgs[:4] + [ msgs[4]._pt.value ])
+    assert len(headers) == 5
+    assert list(headers['seqNum']) == [ m.getSeqNum() for m in msgs ]
+    assert list(headers['ttl']) == [ 0, 1000, 2000, 3000, 4000 ]
+    assert set(headers['cos']) == { Message.COS_2 }
+    assert list(headers['attachmentLen']) == [ 0, 1, 0, 3, 0 ]
+    assert list(headers['senderTimestamp']) == [ 0, 1001, 0, 1003, 0 ]
+    assert not headers['redelivered'].any() and not headers['discard'].any()
+    assert msgs[1].getSenderTimestamp() == 1001 and msgs[0].getSenderTimestamp() is None
+
+    with pytest.raises(ValueError):
+        extractor.extract(msgs, out=headers[:2])
+
+    assert extractor.dtype.fields['senderTimestamp'][1] % 8 == 0
+    numpy = pytest.importorskip('numpy')
+    parent = numpy.zeros(10, extractor.dtype)
+    parent['seqNum'] = -1
+    for out in (parent[::2], parent[::-1]):
+        with pytest.raises(ValueError):
+            extractor.extract(msgs, out=out)
+    assert (parent['seqNum'] == -1).all()
+    readonly = numpy.zeros(5, extractor.dtype)
+    readonly.flags.writeable = False
+    with pytest.raises(ValueError):
+        extractor.extract(msgs, out=readonly)
+
+    rows = extractor.extract(msgs, out=parent[3:])
+    assert list(parent['seqNum'][3:8]) == list(rows['seqNum']) == [ 0, 1, 2, 3, 4 ]
+    assert list(parent['seqNum'][:3]) + list(parent['seqNum'][8:]) == [ -1 ] * 5
+
+def test_stats_snapshot_exporter(tmp_path):
+    before = StatsSnapshot({ 'RX_DIRECT_MSGS': 10, 'TX_WINDOW_CLOSE': 5 }, timestamp=100.0)
+    after = StatsSnapshot({ 'RX_DIRECT_MSGS': 30, 'TX_WINDOW_CLOSE': 2 }, timestamp=102.0)
+    delta = after - before
+    assert delta.interval == 2.0
+    assert delta['RX_DIRECT_MSGS'] == 20 and delta['TX_WINDOW_CLOSE'] == 2
+    assert delta.rates()['RX_DIRECT_MSGS'] == 10.0
+    with pytest.raises(ValueError):
+        after.rates()
+
+    class Source:
+        def __init__(self, snap):
+            self.snap = snap
+        def stats(self):
+            return self.snap
+
+    exporter = StatsExporter({ 'a': Source(before), 'b"': Source(after) }, path=str(tmp_path / 'sol.prom'))
+    text = exporter.render()
+    assert '# TYPE solclient_rx_direct_msgs_total counter\n' in text
+    assert 'solclient_rx_direct_msgs_total{source="a"} 10\n' in text
+    assert 'solclient_tx_window_close_total{source="b\\""} 2\n' in text
+
+    exporter.write()
+    assert (tmp_path / 'sol.prom').read_text() == text
+    assert len(Stats.RX) == len(set(Stats.RX)) and len(Stats.TX) == len(set(Stats.TX))
+
+def test_latency_histogram():
+    h = LatencyHistogram()
+    for v in range(1, 10001):
+        h.record(v)
+    assert h.count == 10000 and h.min == 1 and h.max == 10000
+    assert abs(h.percentile(50) - 5000) / 5000 < 0.04
+    assert abs(h.percentile(99) - 9900) / 9900 < 0.04
+    assert h.percentile(100) == 10000
+
+    other = LatencyHistogram()
+    other.record(10 ** 9)
+    assert len(other.counts) == 1
+    h += LatencyHistogram.fromDict(other.toDict())
+    assert h.count == 10001 and h.max == 10 ** 9
+    assert h.summary()['p50'] == h.percentile(50)
+
+def test_instrumentation():
+    import io
+    instrumentation.enable()
+    try:
+        msg = Message()
+        msg.setSeqNum(1)
+        msg.setSeqNum(2)
+        cb = instrumentation.callback('test', lambda *args: CALLBACK_TAKE_MSG)
+        assert cb(None, None, None) == CALLBACK_TAKE_MSG
+    finally:
+        instrumentation.disable()
+    assert not isinstance(Message.__dict__['_setSeqNum'], staticmethod)
+
+    hists = instrumentation.histograms()
+    assert hists['Message._setSeqNum'].count == 2
+    assert hists['errcheck:solClient_msg_setSequenceNumber'].count == 2
+    assert hists['callback:test'].count == 1
+
+    out = io.StringIO()
+    summaries = instrumentation.report(file=out)
+    assert 'Message._setSeqNum' in out.getvalue() and summaries['Message._setSeqNum']['count'] == 2
+
+    instrumentation.reset()
+    assert not instrumentation.histograms()['Message._setSeqNum'].count
+    assert instrumentation.callback('off', len) is len
+
+    import pysolclient.instrumentation
+    assert pysolclient.instrumentation is instrumentation and not instrumentation.enabled
+
+def test_thread_histograms_prune():
+    import threading
+    hists = pysolclient._ThreadHistograms()
+    for n in range(3):
+        t = threading.Thread(target=lambda: hists.get('a').record(1000))
+        t.start()
+        t.join()
+    hists.get('a').record(2000)
+
+    # finished threads are folded into the retired histograms
+    assert hists.merged()['a'].count == 4
+    assert len(hists._threadHists) == 1 and hists._retired['a'].count == 3
+    hists.reset()
+    assert hists.merged()['a'].count == 0
+
+def test_latency_histogram_concurrent_merge():
+    import threading
+    h = LatencyHistogram()
+    done = threading.Event()
+    def record():
+        for v in range(1, 1 << 40, 997):
+            if done.is_set():
+                return
+            h.record(v)
+    t = threading.Thread(target=record)
+    t.start()
+    try:
+        for _ in range(200):
+            LatencyHistogram().merge(h)
+            h.toDict()
+    finally:
+        done.set()
+        t.join()
+
+def test_latency_tracker():
+    received = []
+    tracker = LatencyTracker(lambda s, m, u: received.append(m) or CALLBACK_OK)
+
+    for topic, age_ms in (('a', 5), ('a', 7), ('b', 20), (None, 0)):
+        msg = Message()
+        if topic is not None:
+            msg.setDest(topic)
+            msg.setSenderTimestamp(time.time_ns() // 1000000 - age_ms)
+        assert tracker.callback(None, msg._pt.value, None) == CALLBACK_OK
+
+    assert len(received) == 4 and tracker.missing == 1
+    summary = tracker.summary()
+    assert set(summary) == { 'a', 'b' } and summary['a']['count'] == 2
+    assert 5 <= summary['a']['p50'] < 9
+    assert 20 <= summary['b']['p99.9'] < 23
+
+    other = LatencyTracker()
+    other.merge(tracker.snapshot())
+    other.merge(tracker.snapshot())
+    assert other.summary()['a']['count'] == 4
+
+    stamped = Message()
+    LatencyTracker.stamp(stamped)
+    assert abs(stamped.getSenderTimestamp() - time.time() * 1000) < 1000
@@ -0,0 +1,51 @@
+from pysolclient import Message, SolaceError, ReturnCode, perf
+import json
+import time
+import pytest
+
+def test_perf_loopback(tmp_path):
+    out = tmp_path / 'perf.json'
+    result = perf.main([ '-P', '2', '-S', '2', '-n', '500', '-s', '10,100', '-T', '3',
+        '-m', 'persistent', '-w', '8', '-o', str(out) ])
+    assert json.loads(out.read_text()) == result
+
+    assert [ r['payload'] for r in result['runs'] ] == [ 10, 100 ]
+    for r in result['runs']:
+        assert r['published'] == 1000 and r['received'] == r['expected'] == 2000
+        assert r['lost'] == 0 and r['duplicates'] == 0 and r['foreign'] == 0
+        assert r['msgPerSec'] > 0 and r['latencyUs']['p50'] <= r['latencyUs']['p99.9']
+
+def test_perf_subscriber_foreign():
+    sentAt = [ [ time.perf_counter_ns(), 0 ] ]
+    sub = perf.Subscriber(sentAt)
+
+    # no sequence number, unknown publisher, beyond the run, not sent yet
+    for seq in (None, 1 << perf.SEQ_BITS, 2, 1, 0):
+        msg = Message()
+        if seq is not None:
+            msg.setSeqNum(seq)
+        sub.callback(None, msg._pt.value, None)
+    assert (sub.foreign, sub.received) == (4, 1)
+
+def test_perf_session_send_failure(monkeypatch):
+    cfg = perf.parseArgs([ '--host', 'localhost', '-w', '4' ])
+    transport = perf.SessionTransport(cfg)
+    def sendMsg(msg):
+        raise SolaceError(ReturnCode.FAIL, 'sendMsg')
+    monkeypatch.setattr(transport.publisher, 'sendMsg', sendMsg)
+
+    msg = Message()
+    msg.setDelivery(Message.DELIVERY_MODE_PERSISTENT)
+    with pytest.raises(SolaceError):
+        transport.send(msg, lambda: None)
+    assert len(transport.registry) == 0
+    transport.close(idle=0)
+
+def test_perf_session():
+    # needs a broker
+    result = perf.main([ '--host', 'localhost', '--vpn', 'default', '--username', 'default',
+        '-P', '2', '-S', '2', '-n', '100', '-T', '3', '-m', 'persistent', '-w', '8' ])
+    assert result['transport'] == 'session' and result['host'] == 'localhost'
+    run = result['runs'][0]
+    assert run['published'] == 200 and run['received'] == run['expected'] == 400
+    assert run['lost'] == 0 and run['foreign'] == 0
@@ -0,0 +1,53 @@
+from pysolclient import SessionProperties, ShardedConsumer
+import time
+
+# fake worker targets, with the arguments of _shardedConsumerMain
+
+def _idleWorker(idx, props, handler, topics, queueName, stats, stop, statsInterval):
+    stats.put((idx, { 'topics': topics, 'queue': queueName }))
+    stop.wait()
+
+def _crashingWorker(idx, props, handler, topics, queueName, stats, stop, statsInterval):
+    stats.put((idx, { 'topics': topics }))
+    raise SystemExit(1)
+
+def _floodingWorker(idx, props, handler, topics, queueName, stats, stop, statsInterval):
+    while not stop.wait(statsInterval):
+        stats.put((idx, { 'blob': 'x' * 100000 }))
+
+def test_sharded_consumer_stop_drains():
+    consumer = ShardedConsumer(SessionProperties(), print, workers=2, statsInterval=0.001,
+            startMethod='fork', target=_floodingWorker)
+    consumer.start()
+    time.sleep(0.3)
+    start = time.monotonic()
+    stats = consumer.stop(timeout=5)
+    assert time.monotonic() - start < 5
+    assert [ p.exitcode for p in consumer._procs ] == [ 0, 0 ] and set(stats) == { 0, 1 }
+
+def test_sharded_consumer_topics():
+    consumer = ShardedConsumer(SessionProperties(), print, workers=2, topics=[ 'a', 'b', 'c', 'd', 'e' ],
+            queueName='q', statsInterval=0.05, startMethod='fork', target=_idleWorker)
+    assert consumer.shardTopics(0) == [ 'a', 'c', 'e' ] and consumer.shardTopics(1) == [ 'b', 'd' ]
+
+    consumer.start()
+    deadline = time.monotonic() + 5
+    while len(consumer.stats()) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stats = consumer.stop(timeout=5)
+    assert stats[0]['topics'] == [ 'a', 'c', 'e' ] and stats[1]['topics'] == [ 'b', 'd' ]
+    assert stats[0]['queue'] == 'q' and consumer.restarts == [ 0, 0 ]
+
+def test_sharded_consumer_restart():
+    consumer = ShardedConsumer(SessionProperties(), print, workers=1, statsInterval=0.01,
+            startMethod='fork', restartBackoff=0.05, maxBackoff=0.2, maxRestarts=3, target=_crashingWorker)
+    start = time.monotonic()
+    consumer.start()
+    deadline = start + 10
+    while consumer._procs[0] is not None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # backoff of 0.05, 0.1 and 0.2 seconds, then no more restarts
+    assert consumer._procs[0] is None and consumer.restarts == [ 3 ]
+    assert time.monotonic() - start >= 0.35
+    assert consumer.stop()[0]['restarts'] == 3
@@ -1,8 +1,10 @@
 from pysolclient import *
 from pysolclient import _defaultEventCallback
 from ctypes import *
+import asyncio
 import time
 import pprint
+import pytest
 
 def test_destination_eq():
     c = Destination()
@@ -21,6 +23,57 @@ def test_destination_eq():
     d.destType = Destination.QUEUE
     assert c == d
 
+def test_destination_intern():
+    d = Destination.intern('a/b')
+    assert d is Destination.intern('a/b')
+    assert d is not Destination.intern('a/b', Destination.QUEUE)
+    assert d == Destination('a/b') and Destination('a/b') == d
+    assert { d: 1 }[Destination.intern('a/b')] == 1
+
+    with pytest.raises(AttributeError):
+        d.dest = b'c'
+    with pytest.raises(AttributeError):
+        d.setDest('c')
+
+    tmpl = DestinationTemplate('md/{venue}/{sym}', cacheSize=2)
+    assert tmpl.fields == ('venue', 'sym')
+    assert tmpl('NYSE', sym='IBM') is tmpl(venue='NYSE', sym='IBM')
+    assert tmpl('NYSE', 'IBM') is Destination.intern('md/NYSE/IBM')
+    assert tmpl.cacheInfo().hits == 2
+    with pytest.raises(TypeError):
+        tmpl('NYSE')
+    with pytest.raises(ValueError):
+        DestinationTemplate('md/{}/{sym}')
+
+def test_properties_cache():
+    fprops = FlowProperties(BIND_NAME='q', BIND_ENTITY_ID=FlowProperties.BIND_ENTITY_QUEUE)
+
+    props = fprops.toCPropsArray()
+    assert fprops.toCPropsArray() is props
+    assert len(props) == 5 and props[-1] is None
+
+    fprops.WINDOWSIZE = '10'
+    changed = fprops.toCPropsArray()
+    assert changed is not props
+    assert len(changed) == 7
+
+    loaded = FlowProperties()
+    loaded.loadCPropsArray(changed)
+    assert loaded._props() == fprops._props()
+
+def test_context_properties_defaults():
+    a = ContextProperties()
+    b = ContextProperties()
+    assert a._props() == b._props()
+    assert a.CREATE_THREAD == PROP_ENABLE_VAL
+
+def test_flow_ack_ptr(monkeypatch):
+    acked = []
+    monkeypatch.setattr(Flow, '_ack', staticmethod(lambda flow_p, msgId: acked.append((flow_p, msgId))))
+    msg = Message()
+    Flow.ackPtr(1234, msg._pt.value)
+    assert acked == [ (1234, msg.getMsgId()) ]
+
 def test_connect_non_blocking():
     context = Context()
 
@@ -34,6 +87,230 @@ def test_connect_non_blocking():
     
     assert session.connect() == ReturnCode.IN_PROGRESS
 
+def test_async_session():
+    topic = 'nosetest/async/test_async_session'
+
+    async def run():
+        context = AsyncioContext()
+        sprops = SessionProperties(\
+                HOST='localhost',
+                VPN_NAME='default',
+                USERNAME='default')
+
+        session = AsyncSession(context, sprops)
+        assert await session.connect() == ReturnCode.OK
+        assert await session.subscribe(topic) == ReturnCode.OK
+
+        msg = Message()
+        msg.applyProps(Dest=Destination(topic),
+                Delivery=Message.DELIVERY_MODE_DIRECT)
+        assert await session.publish(msg) == ReturnCode.OK
+
+        session.disconnect()
+        context.close()
+
+    asyncio.run(run())
+
+def test_asyncio_context_close(monkeypatch):
+    import gc, sys, weakref
+
+    # no running loop: an error, and nothing to clean up
+    unraisable = []
+    monkeypatch.setattr(sys, 'unraisablehook', unraisable.append)
+    with pytest.raises(RuntimeError):
+        AsyncioContext()
+    gc.collect()
+    assert unraisable == []
+
+    async def run():
+        props = ContextProperties()
+        before = props._props()
+        context = AsyncioContext(props=props)
+        assert props._props() == before
+        assert context._timer is not None
+
+        context.close()
+        assert not context._pt and context._timer is None
+        context.close()
+
+        ref = weakref.ref(AsyncioContext())
+        gc.collect()
+        assert ref() is None
+
+    asyncio.run(run())
+
+def test_async_session_events(monkeypatch):
+    # no broker: events are fabricated and fed to the event callback
+    def event(kind, corrId=None):
+        return pointer(EventCallbackInfo(kind, 0, b'', corrId))
+
+    with pytest.raises(RuntimeError):
+        AsyncSession(Context(), SessionProperties(HOST='localhost'))
+
+    created = []
+    toCPropsArray = SessionProperties.toCPropsArray
+    monkeypatch.setattr(SessionProperties, 'toCPropsArray',
+            lambda self: created.append(self._props()) or toCPropsArray(self))
+
+    async def run():
+        context = Context()
+        sprops = SessionProperties(HOST='localhost', ACK_EVENT_MODE=SessionProperties.ACK_EVENT_MODE_WINDOWED)
+        before = sprops._props()
+        session = AsyncSession(context, sprops)
+        assert sprops._props() == before
+        assert created[-1]['ACK_EVENT_MODE'] == SessionProperties.ACK_EVENT_MODE_PER_MSG
+
+        acked, rejected, pending = [ session._track() for _ in range(3) ]
+        session._onEvent(None, event(SessionEvent.ACKNOWLEDGEMENT, acked[0]), None)
+        session._onEvent(None, event(SessionEvent.REJECTED_MSG_ERROR, rejected[0]), None)
+
+        assert await acked[1] == ReturnCode.OK
+        with pytest.raises(SolaceError):
+            await rejected[1]
+        assert not pending[1].done()
+
+        session._connecting = session.loop.create_future()
+        session._onEvent(None, event(SessionEvent.DOWN_ERROR), None)
+        for fut in (pending[1], session._connecting):
+            with pytest.raises(SolaceError):
+                await fut
+        assert not session._pending
+
+        session._canSend.clear()
+        session._onEvent(None, event(SessionEvent.CAN_SEND), None)
+        await asyncio.wait_for(session._canSend.wait(), 1)
+
+    asyncio.run(run())
+
+def test_subscribe_many_would_block(monkeypatch):
+    # no broker: requests are confirmed as they are sent, except 'b/blocked'
+    session = Session(Context(), SessionProperties(HOST='localhost'))
+    sent = []
+    def subscribe(session_p, flags, topic, dispatch, corrId):
+        if topic == b'b/blocked':
+            return ReturnCode.WOULD_BLOCK
+        sent.append(topic)
+        if corrId:
+            session.subscriptionEvent(pointer(EventCallbackInfo(SessionEvent.SUBSCRIPTION_OK, 0, b'', corrId)))
+        return ReturnCode.OK
+    subscribe.__name__ = 'topicSubscribe'
+    monkeypatch.setattr(session, '_topicSubDispatch', subscribe)
+    monkeypatch.setattr(session, '_topicUnsubDispatch', subscribe)
+
+    errors = session.subscribeMany(t for t in [ 'a', 'b/blocked', 'c' ])
+    assert list(errors) == [ 'b/blocked' ] and errors['b/blocked'].rc == ReturnCode.WOULD_BLOCK
+    assert sent == [ b'a', b'c' ] and session.subscriptions == { 'a', 'c' }
+
+    errors = session.subscribeMany([ 'd', 'b/blocked' ], timeout=0.1)
+    assert list(errors) == [ 'b/blocked' ] and session.subscriptions == { 'a', 'c', 'd' }
+
+    assert session.unsubscribeMany(t for t in [ 'a', 'c' ]) == {}
+    assert session.subscriptions == { 'd' }
+
+    monkeypatch.setattr(session, '_topicSubExt', lambda session_p, flags, topic: ReturnCode.WOULD_BLOCK)
+    assert session.topicSubscribe('e', 0) == ReturnCode.WOULD_BLOCK
+    assert session.subscriptions == { 'd' }
+
+def test_subscribe_many_custom_event_callback(monkeypatch):
+    # confirmations reach subscribeMany() past a custom event callback
+    events = []
+    funcInfo = SessionFuncInfo()
+    funcInfo.setMsgCallback(lambda session_p, msg_p, user_p: CALLBACK_OK)
+    funcInfo.setEventCallback(lambda session_p, eventInfo_p, user_p: events.append(eventInfo_p.contents.sessionEvent))
+    session = Session(Context(), SessionProperties(HOST='localhost'), funcInfo)
+
+    def event(kind, corrId=None):
+        funcInfo.eventInfo.callback_p(None, pointer(EventCallbackInfo(kind, 0, b'', corrId)), None)
+    def subscribe(session_p, flags, topic, dispatch, corrId):
+        if corrId:
+            event(SessionEvent.SUBSCRIPTION_OK, corrId)
+        return ReturnCode.OK
+    monkeypatch.setattr(session, '_topicSubDispatch', subscribe)
+
+    assert session.subscribeMany([ 'a', 'b', 'c' ], timeout=1) == {}
+    assert session.subscriptions == { 'a', 'b', 'c' }
+    event(SessionEvent.UP_NOTICE)
+    event(SessionEvent.SUBSCRIPTION_OK, 12345)
+    assert events == [ SessionEvent.UP_NOTICE, SessionEvent.SUBSCRIPTION_OK ]
+
+def test_subscribe_destination(monkeypatch):
+    session = Session(Context(), SessionProperties(HOST='localhost'))
+    def confirm(session_p, flags, topic, dispatch, corrId):
+        if corrId:
+            session.subscriptionEvent(pointer(EventCallbackInfo(SessionEvent.SUBSCRIPTION_OK, 0, b'', corrId)))
+        return ReturnCode.OK
+    monkeypatch.setattr(session, '_topicSubDispatch', confirm)
+    monkeypatch.setattr(session, '_topicUnsubDispatch', confirm)
+
+    session.topicSubscribe(Destination('a/b'))
+    session.topicSubscribe(Destination.intern('a/b'))
+    session.topicSubscribe(b'a/c', 0)
+    assert session.subscriptions == { 'a/b', 'a/c' }
+
+    assert session.subscribeMany([ Destination('x'), Destination.intern('y'), b'z' ]) == {}
+    assert session.subscriptions == { 'a/b', 'a/c', 'x', 'y', 'z' }
+
+    assert session.setSubscriptions([ 'a/b', Destination.intern('x'), Destination('n') ]) == {}
+    assert session.subscriptions == { 'a/b', 'x', 'n' }
+
+def test_topic_unsubscribe_dispatch(monkeypatch):
+    session = Session(Context(), SessionProperties(HOST='localhost'))
+    unsubscribed = []
+    def unsubscribe(session_p, flags, topic, dispatch, corrId):
+        unsubscribed.append(topic)
+        return ReturnCode.OK
+    monkeypatch.setattr(session, '_topicUnsubDispatch', unsubscribe)
+
+    first, second = (lambda s, m, u: CALLBACK_OK), (lambda s, m, u: CALLBACK_OK)
+    session.topicSubscribeDispatch('two/*', 0, first, 1)
+    session.topicSubscribeDispatch('two/*', 0, second, 2)
+
+    # the second handler keeps the subscription
+    assert session.topicUnsubscribeDispatch('two/*', 0, first, 1) == ReturnCode.OK
+    assert unsubscribed == [] and 'two/*' in session.subscriptions
+    assert session._router().match('two/x') == ((second, 2),)
+
+    assert session.topicUnsubscribeDispatch('two/*', 0, second, 2) == ReturnCode.OK
+    assert unsubscribed == [ b'two/*' ] and not session.subscriptions
+
+def test_partitioned_publisher(monkeypatch):
+    # no broker: session events are fabricated and fed to each partition
+    def event(part, kind):
+        pub._eventCallback(part)(None, pointer(EventCallbackInfo(kind, 0, b'', None)), None)
+
+    settled = []
+    pub = PartitionedPublisher(SessionProperties(HOST='localhost'), partitions=3,
+            contexts=[ Context() ], onSettled=lambda obj, accepted: settled.append((obj, accepted)))
+    pub.connect()
+    assert not any(part.up for part in pub.partitions)
+    with pytest.raises(SolaceError):
+        pub.partitionFor('key')
+
+    for part in pub.partitions:
+        event(part, SessionEvent.UP_NOTICE)
+    home = pub.partitionFor('key')
+    failover = pub.partitions[(home.index + 1) % 3]
+
+    event(home, SessionEvent.DOWN_ERROR)
+    assert pub.partitionFor('key') is failover
+    event(home, SessionEvent.RECONNECTED_NOTICE)
+    assert pub.partitionFor('key') is home
+
+    msg = Message()
+    msg.setDest(Destination('a'))
+    msg.setDelivery(Message.DELIVERY_MODE_PERSISTENT)
+
+    monkeypatch.setattr(home.session, 'sendMsg', lambda msg: ReturnCode.WOULD_BLOCK)
+    assert pub.send(msg, 'key', 'first') == ReturnCode.WOULD_BLOCK
+    assert len(home.registry) == 0 and home.sent == 0
+    monkeypatch.undo()
+
+    assert pub.send(msg, 'key', 'second') == ReturnCode.OK
+    assert len(home.registry) == 1 and home.sent == 1
+    event(home, SessionEvent.DOWN_ERROR)
+    assert settled == [ ('second', False) ] and len(home.registry) == 0
+    pub.disconnect()
+
 class TestDirectMessages:
     @classmethod
     def setup_class(cls):
@@ -125,3 +402,60 @@ class TestDirectMessages:
         pprint.pprint(data.__dict__)
 
         assert data.received == messages
+
+    def test_send_multiple(self):
+        topic = 'nosetest/direct/test_send_multiple'
+        messages = 1234
+        wait_timeout = 10
+
+        received = [0]
+        def rxMsg(session_p, msg_p, user_p):
+            received[0] += 1
+            return CALLBACK_OK
+
+        funcInfo = SessionFuncInfo()
+        funcInfo.setMsgCallback(rxMsg)
+        funcInfo.setEventCallback(_defaultEventCallback)
+
+        session = Session(self.context, self.sprops, funcInfo)
+        session.connect()
+
+        session.topicSubscribe(topic)
+
+        msgs = []
+        for _ in range(messages):
+            msg = Message()
+            msg.applyProps(Dest=Destination(topic),
+                    Delivery=Message.DELIVERY_MODE_DIRECT)
+            msgs.append(msg)
+
+        pending = msgs
+        while pending:
+            rc, pending = session.sendMultiple(pending)
+            assert rc in (ReturnCode.OK, ReturnCode.WOULD_BLOCK)
+
+        while wait_timeout > 0:
+            if received[0] == messages: break
+            time.sleep(0.1)
+            wait_timeout -= 0.1
+
+        session.disconnect()
+
+        assert received[0] == messages
+
+    def test_subscribe_many(self):
+        session = Session(self.context, self.sprops)
+        session.connect()
+
+        topics = [ 'nosetest/direct/many/{}'.format(n) for n in range(500) ]
+        assert session.subscribeMany(topics) == {}
+        assert session.subscriptions == set(topics)
+
+        desired = topics[250:] + [ 'nosetest/direct/many/x' ]
+        assert session.setSubscriptions(desired) == {}
+        assert session.subscriptions == set(desired)
+
+        errors = session.subscribeMany([ 'nosetest/direct/many/ok', 'bad//topic' ])
+        assert list(errors) == [ 'bad//topic' ]
+
+        session.disconnect()